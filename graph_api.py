@@ -5,14 +5,14 @@
 
 import json
 import logging
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Tuple, Any, Iterable
 from pathlib import Path
 from functools import wraps
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from datetime import datetime
 
 from graph_system import (
-    GraphStore, GraphQuery, GraphFilter, AttributeFilter, FilterExpression
+    GraphStore, GraphQuery, GraphFilter, AttributeFilter, FilterExpression, Node
 )
 
 logger = logging.getLogger("graph_api")
@@ -195,6 +195,49 @@ class GraphAPI:
             return f(*args, **kwargs)
         return decorated_function
     
+    @staticmethod
+    def _batch_items(data: Optional[Dict], key: str) -> List[Dict]:
+        """Get the non-empty list of items under key from a batch request body"""
+        if not data:
+            raise ValidationError("Request body is required")
+        items = data.get(key)
+        if not isinstance(items, list) or not items:
+            raise ValidationError(f"{key} must be a non-empty list")
+        if not all(isinstance(item, dict) for item in items):
+            raise ValidationError(f"{key} must contain objects")
+        return items
+    
+    # Map API direction names to GraphQuery direction names
+    DIRECTION_MAPPING = {
+        "outgoing": "out",
+        "incoming": "in",
+        "both": "both"
+    }
+    
+    def _find_related(self, node_id: str, lazy: bool = False) -> Tuple[str, Iterable[Tuple[Node, str]]]:
+        """
+        Find nodes related to node_id per the direction and relationship_type query args
+        
+        Returns:
+            The requested direction and the (node, relationship) pairs, as a
+            list or, when lazy is set, an iterator
+        """
+        direction = request.args.get("direction", "both")
+        relationship_type = request.args.get("relationship_type")
+        graph_direction = self.DIRECTION_MAPPING.get(direction, "both")
+        find = self.query.iter_related_nodes if lazy else self.query.find_related_nodes
+        return direction, find(node_id, relationship_type, graph_direction)
+    
+    @staticmethod
+    def _related_payload(node_id: str, direction: str, related: List[Tuple[Node, str]]) -> Dict:
+        """Build the JSON body describing the nodes related to node_id"""
+        return {
+            "node_id": node_id,
+            "direction": direction,
+            "related_count": len(related),
+            "related": [{"node": n.to_dict(), "relationship": rel_type} for n, rel_type in related]
+        }
+    
     def _setup_error_handlers(self):
         """Setup error handlers"""
         @self.app.errorhandler(GraphAPIError)
@@ -288,6 +331,19 @@ class GraphAPI:
             except ValueError as e:
                 raise ValidationError(str(e))
         
+        @self.app.route("/api/v1/nodes/batch", methods=["POST"])
+        @self._require_auth
+        def create_nodes():
+            """Create several nodes in one request, all or none"""
+            node_reqs = [NodeRequest.from_json(item) for item in self._batch_items(request.get_json(), "nodes")]
+            for node_req in node_reqs:
+                if not self.graph.schema_registry.get_schema(node_req.class_name):
+                    raise ValidationError(f"Unknown class: {node_req.class_name}")
+            
+            with self.graph.batch():
+                nodes = [self.graph.create_node(r.class_name, r.name, r.attributes) for r in node_reqs]
+            return jsonify({"count": len(nodes), "nodes": [n.to_dict() for n in nodes]}), 201
+        
         @self.app.route("/api/v1/nodes/<node_id>", methods=["GET"])
         @self._require_auth
         def get_node(node_id):
@@ -372,6 +428,23 @@ class GraphAPI:
             except ValueError as e:
                 raise ValidationError(str(e))
         
+        @self.app.route("/api/v1/edges/batch", methods=["POST"])
+        @self._require_auth
+        def create_edges():
+            """Create several edges between existing nodes in one request, all or none"""
+            edge_reqs = [EdgeRequest.from_json(item) for item in self._batch_items(request.get_json(), "edges")]
+            for edge_req in edge_reqs:
+                for node_id in (edge_req.from_node_id, edge_req.to_node_id):
+                    if not self.graph.get_node(node_id):
+                        raise ValidationError(f"Node {node_id} not found")
+            
+            with self.graph.batch():
+                edges = [
+                    self.graph.create_edge(r.from_node_id, r.to_node_id, r.edge_type, r.attributes)
+                    for r in edge_reqs
+                ]
+            return jsonify({"count": len(edges), "edges": [e.to_dict() for e in edges]}), 201
+        
         @self.app.route("/api/v1/edges/<edge_id>", methods=["GET"])
         @self._require_auth
         def get_edge(edge_id):
@@ -450,23 +523,49 @@ class GraphAPI:
             if not node:
                 raise NotFoundError("Node", node_id)
             
-            direction = request.args.get("direction", "both")
-            relationship_type = request.args.get("relationship_type")
+            if request.args.get("format") == "ndjson":
+                # One related node per line, looked up as it is sent, so neither
+                # side holds the whole result
+                _, related = self._find_related(node_id, lazy=True)
+                
+                def generate():
+                    for n, rel_type in related:
+                        yield json.dumps({"node": n.to_dict(), "relationship": rel_type}) + "\n"
+                return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+            
+            direction, related = self._find_related(node_id)
+            return jsonify(self._related_payload(node_id, direction, related)), 200
+        
+        @self.app.route("/api/v1/snapshot", methods=["GET"])
+        @self._require_auth
+        def get_snapshot():
+            """Get node, its related nodes and the nodes of a class in one response"""
+            node_id = request.args.get("node_id")
+            if not node_id:
+                raise ValidationError("node_id is required")
+            
+            node = self.graph.get_node(node_id)
+            if not node:
+                raise NotFoundError("Node", node_id)
             
-            # Map API direction names to GraphQuery direction names
-            direction_mapping = {
-                "outgoing": "out",
-                "incoming": "in",
-                "both": "both"
-            }
-            graph_direction = direction_mapping.get(direction, "both")
+            direction, related = self._find_related(node_id)
+            class_name = request.args.get("class")
+            
+            class_nodes = None
+            if class_name:
+                if not self.graph.schema_registry.get_schema(class_name):
+                    raise NotFoundError("Schema", class_name)
+                nodes = self.filter_engine.filter_nodes_by_class(class_name)
+                class_nodes = {
+                    "class_name": class_name,
+                    "count": len(nodes),
+                    "nodes": [n.to_dict() for n in nodes]
+                }
             
-            related = self.query.find_related_nodes(node_id, relationship_type, graph_direction)
             return jsonify({
-                "node_id": node_id,
-                "direction": direction,
-                "related_count": len(related),
-                "related": [{"node": n.to_dict(), "relationship": rel_type} for n, rel_type in related]
+                "node": node.to_dict(),
+                "related": self._related_payload(node_id, direction, related),
+                "class_nodes": class_nodes
             }), 200
         
         # ===================== Filter Routes =====================
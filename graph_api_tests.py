@@ -6,37 +6,46 @@
 import unittest
 import json
 import tempfile
-import shutil
 from pathlib import Path
 import sys
 import os
+import threading
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from graph_system import GraphStore
 from graph_api import GraphAPI, APITokenManager
 
+# Test data only lives for one test class, so keep it on tmpfs where available
+TEMP_ROOT = "/dev/shm" if sys.platform.startswith("linux") and os.path.isdir("/dev/shm") else None
+
 
 class TestGraphAPI(unittest.TestCase):
     """Test Graph REST API"""
     
-    def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.graph = GraphStore(self.temp_dir)
-        self.tokens = APITokenManager({"test_user": "test_token_123"})
-        self.api = GraphAPI(self.graph, self.tokens)
-        self.client = self.api.app.test_client()
+    @classmethod
+    def setUpClass(cls):
+        temp = tempfile.TemporaryDirectory(dir=TEMP_ROOT, prefix="graphtest_")
+        cls.addClassCleanup(temp.cleanup)
+        cls.temp_dir = Path(temp.name)
+        cls.graph = GraphStore(cls.temp_dir)
+        cls.tokens = APITokenManager({"test_user": "test_token_123"})
+        cls.api = GraphAPI(cls.graph, cls.tokens)
+        cls.client = cls.api.app.test_client()
         
         # Register test schema
-        self.graph.schema_registry.register_class(
+        cls.graph.schema_registry.register_class(
             "Person",
             parent_class="Thing",
             attributes={"age": "int", "city": "string"}
         )
+        cls.initial_schemas = dict(cls.graph.schema_registry.schemas)
     
-    def tearDown(self):
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
+    def setUp(self):
+        # Empty the shared store in place instead of rebuilding it per test
+        self.graph.reset()
+        self.graph.schema_registry.reset(self.initial_schemas)
     
     def _get_auth_header(self):
         """Get authorization header"""
@@ -155,6 +164,73 @@ class TestGraphAPI(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 400)
     
+    def test_create_nodes_batch(self):
+        """Test creating several nodes in one request"""
+        payload = {"nodes": [
+            {"class_name": "Person", "name": "Alice", "attributes": {"age": 30}},
+            {"class_name": "Person", "name": "Bob"}
+        ]}
+        response = self.client.post(
+            "/api/v1/nodes/batch",
+            json=payload,
+            headers=self._get_auth_header()
+        )
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        self.assertEqual(data["count"], 2)
+        self.assertEqual([n["name"] for n in data["nodes"]], ["Alice", "Bob"])
+        self.assertIsNotNone(self.graph.get_node(data["nodes"][0]["node_id"]))
+    
+    def test_create_nodes_batch_is_all_or_none(self):
+        """Test that a batch with an invalid node creates nothing"""
+        payload = {"nodes": [
+            {"class_name": "Person", "name": "Alice"},
+            {"class_name": "Unknown", "name": "Bob"}
+        ]}
+        response = self.client.post(
+            "/api/v1/nodes/batch",
+            json=payload,
+            headers=self._get_auth_header()
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.graph.nodes), 0)
+        response = self.client.post(
+            "/api/v1/nodes/batch",
+            json={"nodes": []},
+            headers=self._get_auth_header()
+        )
+        self.assertEqual(response.status_code, 400)
+    
+    def test_create_node_during_another_threads_batch(self):
+        """Test that a request is written through while another thread holds a batch open"""
+        entered, release = threading.Event(), threading.Event()
+        
+        def hold_batch():
+            with self.graph.batch():
+                entered.set()
+                release.wait(5)
+        
+        worker = threading.Thread(target=hold_batch)
+        worker.start()
+        try:
+            self.assertTrue(entered.wait(5))
+            response = self.client.post(
+                "/api/v1/nodes/batch",
+                json={"nodes": [{"class_name": "Person", "name": "Alice"}]},
+                headers=self._get_auth_header()
+            )
+            self.assertEqual(response.status_code, 201)
+            response = self.client.post(
+                "/api/v1/nodes",
+                json={"class_name": "Person", "name": "Bob"},
+                headers=self._get_auth_header()
+            )
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(len(GraphStore(self.temp_dir).nodes), 2)
+        finally:
+            release.set()
+            worker.join()
+    
     def test_get_node(self):
         """Test getting a node"""
         node = self.graph.create_node("Person", "Bob", {"age": 25})
@@ -290,6 +366,42 @@ class TestGraphAPI(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 400)
     
+    def test_create_edges_batch(self):
+        """Test creating several edges in one request"""
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        payload = {"edges": [
+            {"from_node_id": alice.node_id, "to_node_id": bob.node_id, "edge_type": "knows"},
+            {"from_node_id": bob.node_id, "to_node_id": alice.node_id, "edge_type": "knows",
+             "attributes": {"since": 2020}}
+        ]}
+        response = self.client.post(
+            "/api/v1/edges/batch",
+            json=payload,
+            headers=self._get_auth_header()
+        )
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(data["edges"][0]["from_node_id"], alice.node_id)
+        self.assertEqual(data["edges"][1]["attributes"], {"since": 2020})
+        self.assertEqual(len(self.graph.edges), 2)
+    
+    def test_create_edges_batch_invalid_nodes(self):
+        """Test that a batch with a missing node creates no edges"""
+        alice = self.graph.create_node("Person", "Alice")
+        payload = {"edges": [
+            {"from_node_id": alice.node_id, "to_node_id": alice.node_id, "edge_type": "knows"},
+            {"from_node_id": alice.node_id, "to_node_id": "nonexistent", "edge_type": "knows"}
+        ]}
+        response = self.client.post(
+            "/api/v1/edges/batch",
+            json=payload,
+            headers=self._get_auth_header()
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.graph.edges), 0)
+    
     def test_get_edge(self):
         """Test getting an edge"""
         alice = self.graph.create_node("Person", "Alice")
@@ -441,6 +553,27 @@ class TestGraphAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertGreater(data["related_count"], 0)
     
+    def test_query_related_nodes_ndjson(self):
+        """Test streaming related nodes as NDJSON"""
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        charlie = self.graph.create_node("Person", "Charlie")
+        
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.graph.create_edge(charlie.node_id, alice.node_id, "knows")
+        
+        # Streamed from the lazy lookup, never from a materialised list
+        with patch.object(self.api.query, "find_related_nodes", side_effect=AssertionError):
+            response = self.client.get(
+                f"/api/v1/query/related/{alice.node_id}?direction=both&format=ndjson",
+                headers=self._get_auth_header()
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "application/x-ndjson")
+            lines = [json.loads(line) for line in response.data.splitlines() if line]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual({item["node"]["name"] for item in lines}, {"Bob", "Charlie"})
+    
     def test_query_related_nonexistent_node(self):
         """Test querying related for nonexistent node"""
         response = self.client.get(
@@ -449,6 +582,31 @@ class TestGraphAPI(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 404)
     
+    def test_snapshot(self):
+        """Test fetching node, related nodes and class nodes in one call"""
+        alice = self.graph.create_node("Person", "Alice", {"age": 30})
+        bob = self.graph.create_node("Person", "Bob", {"age": 25})
+        
+        self.graph.create_edge(bob.node_id, alice.node_id, "knows")
+        
+        response = self.client.get(
+            f"/api/v1/snapshot?node_id={alice.node_id}&direction=both&class=Person",
+            headers=self._get_auth_header()
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data["node"]["name"], "Alice")
+        self.assertEqual(data["related"]["related_count"], 1)
+        self.assertEqual(data["class_nodes"]["count"], 2)
+    
+    def test_snapshot_nonexistent_node(self):
+        """Test snapshot for nonexistent node"""
+        response = self.client.get(
+            "/api/v1/snapshot?node_id=nonexistent",
+            headers=self._get_auth_header()
+        )
+        self.assertEqual(response.status_code, 404)
+    
     # ===================== Filter Routes Tests =====================
     
     def test_filter_connected_nodes(self):
@@ -5,6 +5,7 @@
 
 import json
 import requests
+from collections import ChainMap
 from typing import Dict, List, Any
 
 
@@ -20,21 +21,22 @@ class GraphClient:
             token: Bearer token for authentication
         """
         self.base_url = base_url
+        self._api_prefix = base_url.rstrip("/") + "/api/v1"
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
     
-    def _get(self, endpoint: str) -> Dict[str, Any]:
+    def _get(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
         """GET request"""
-        url = f"{self.base_url}/api/v1{endpoint}"
-        response = requests.get(url, headers=self.headers)
+        url = self._api_prefix + endpoint
+        response = requests.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
     
     def _post(self, endpoint: str, data: Dict) -> Dict[str, Any]:
         """POST request"""
-        url = f"{self.base_url}/api/v1{endpoint}"
+        url = self._api_prefix + endpoint
         response = requests.post(url, headers=self.headers, json=data)
         response.raise_for_status()
         return response.json()
@@ -70,6 +72,21 @@ class GraphClient:
         """Filter nodes by class"""
         data = {"filter": filters} if filters else {}
         return self._post(f"/filter/by-class/{class_name}", data)
+    
+    def snapshot(self, node_id: str, direction: str = "both", class_name: str = None) -> Dict:
+        """Get node, related nodes and nodes of a class in a single request"""
+        params = {"node_id": node_id, "direction": direction}
+        if class_name:
+            params["class"] = class_name
+        return self._get("/snapshot", params)
+
+
+DISPLAY_DEFAULTS = {"city": "N/A", "age": "N/A", "email": "N/A"}
+
+
+def _display(attributes: Dict) -> ChainMap:
+    """View of node attributes falling back to 'N/A' for display fields"""
+    return ChainMap(attributes, DISPLAY_DEFAULTS)
 
 
 def print_header(text: str):
@@ -195,7 +212,8 @@ def main():
         # Step 5: Query Node Alice
         # ====================================================================
         print_header("Step 5: Query Node - Alice")
-        alice_retrieved = client.get_node(alice_id)
+        snapshot = client.snapshot(alice_id, direction="both", class_name="Person")
+        alice_retrieved = snapshot["node"]
         print(f"✓ Node retrieved successfully")
         print_node(alice_retrieved, indent="  ")
         
@@ -204,8 +222,8 @@ def main():
         # ====================================================================
         print_header("Step 6: Find All Connected Person Nodes")
         
-        # First, get all connected nodes for Alice
-        related_response = client.get_related_nodes(alice_id, direction="both")
+        # Alice's connections came with the snapshot, no second request needed
+        related_response = snapshot["related"]
         related_nodes = related_response.get("related", [])
         
         print(f"✓ Found {related_response['related_count']} connected node(s)")
@@ -215,12 +233,11 @@ def main():
             for connection in related_nodes:
                 node = connection["node"]
                 relationship = connection["relationship"]
+                d = _display(node['attributes'])
                 print(f"\n  Node Information:")
                 print(f"    Name: {node['name']}")
                 print(f"    Class: {node['class_name']}")
-                print(f"    City: {node['attributes'].get('city', 'N/A')}")
-                print(f"    Age: {node['attributes'].get('age', 'N/A')}")
-                print(f"    Email: {node['attributes'].get('email', 'N/A')}")
+                print(f"    City: {d['city']}\n    Age: {d['age']}\n    Email: {d['email']}")
                 print_connection("Alice", node['name'], relationship)
         else:
             print("\n  No connected nodes found")
@@ -230,15 +247,14 @@ def main():
         # ====================================================================
         print_header("Step 7: Alternative - List All Person Nodes")
         
-        all_persons = client.filter_by_class("Person")
+        all_persons = snapshot["class_nodes"]
         print(f"✓ Found {all_persons['count']} Person node(s)")
         
         for person in all_persons["nodes"]:
             print(f"\n  {person['name']}:")
             print(f"    ID: {person['node_id']}")
-            print(f"    Age: {person['attributes'].get('age', 'N/A')}")
-            print(f"    City: {person['attributes'].get('city', 'N/A')}")
-            print(f"    Email: {person['attributes'].get('email', 'N/A')}")
+            d = _display(person['attributes'])
+            print(f"    Age: {d['age']}\n    City: {d['city']}\n    Email: {d['email']}")
         
         # ====================================================================
         # Summary
@@ -4,14 +4,42 @@
 # ============================================================================
 
 import json
+import math
+import operator
+import os
+import re
+import itertools
+import sys
+import threading
 import uuid
-from typing import Optional, Dict, List, Set, Tuple, Any
+from array import array
+from typing import Optional, Dict, List, Set, Tuple, Any, Iterator, Callable, Sequence
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 import logging
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+
+# Optional acceleration: numpy for columnar filtering, numba for traversal
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional faster JSON (de)serialization for persistence
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("graph_system")
 
@@ -31,6 +59,10 @@ class EdgeType(Enum):
 # Models
 # ============================================================================
 
+# Nodes and edges are created in bulk; drop their per-instance __dict__ where supported
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 @dataclass
 class NodeSchema:
     """Schema definition for a node class"""
@@ -47,7 +79,7 @@ class NodeSchema:
         return NodeSchema(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Node:
     """Graph node representing an entity"""
     node_id: str
@@ -57,6 +89,11 @@ class Node:
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     
+    def __post_init__(self):
+        # Interned so nodes loaded from disk share one string per class
+        if isinstance(self.class_name, str):
+            self.class_name = sys.intern(self.class_name)
+    
     def to_dict(self) -> Dict:
         return {
             "node_id": self.node_id,
@@ -72,7 +109,7 @@ class Node:
         return Node(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Edge:
     """Graph edge representing a relationship"""
     edge_id: str
@@ -82,6 +119,11 @@ class Edge:
     attributes: Dict[str, Any] = field(default_factory=dict)
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     
+    def __post_init__(self):
+        # Interned so edge type comparisons in traversals are mostly identity checks
+        if isinstance(self.edge_type, str):
+            self.edge_type = sys.intern(self.edge_type)
+    
     def to_dict(self) -> Dict:
         return {
             "edge_id": self.edge_id,
@@ -97,6 +139,135 @@ class Edge:
         return Edge(**data)
 
 
+@dataclass
+class CSRAdjacency:
+    """Compressed sparse row view of the graph over integer node indices"""
+    node_ids: List[str]              # index -> node_id
+    index: Dict[str, int]            # node_id -> index
+    indptr: array                    # neighbours of i are indices[indptr[i]:indptr[i + 1]]
+    indices: array                   # neighbour index per entry (out and in edges)
+    etypes: array                    # edge type code per entry
+    type_codes: Dict[str, int]       # edge_type -> code
+
+
+# Every int up to this magnitude converts to float64 exactly
+_MAX_EXACT_INT = 2 ** 53
+
+
+class AttributeColumns:
+    """
+    Column-oriented view of node attributes for vectorized filtering
+    
+    Columns are built lazily per attribute. Each column is a (kind, values,
+    present) triple where kind is "int", "float", "str" or "object"; only
+    the first three are backed by typed numpy arrays. Columns that numpy
+    could not compare exactly like Python (mixed types, ints beyond float
+    precision, strings with NULs) are "object" and filtered row by row.
+    Requires numpy.
+    """
+    
+    def __init__(self, nodes: List[Node]):
+        self.nodes = nodes
+        self._columns: Dict[str, Tuple[str, Any, Any]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.nodes)
+    
+    def column(self, attribute: str) -> Tuple[str, Any, Any]:
+        """Get (kind, values, present) for an attribute"""
+        column = self._columns.get(attribute)
+        if column is None:
+            column = self._columns[attribute] = self._build_column(attribute)
+        return column
+    
+    def _build_column(self, attribute: str) -> Tuple[str, Any, Any]:
+        missing = object()
+        raw = [node.attributes.get(attribute, missing) for node in self.nodes]
+        present = np.fromiter((v is not missing for v in raw), dtype=np.bool_, count=len(raw))
+        values = [v for v in raw if v is not missing]
+        types = {type(v) for v in values}
+        
+        if types <= {int} and all(-_MAX_EXACT_INT <= v <= _MAX_EXACT_INT for v in values):
+            kind, dtype, fill = "int", np.int64, 0
+        elif types == {float}:
+            kind, dtype, fill = "float", np.float64, 0.0
+        elif types == {str} and not any("\x00" in v for v in values):  # np.str_ drops trailing NULs
+            kind, dtype, fill = "str", np.str_, ""
+        else:
+            return "object", None, present
+        
+        array_values = np.array([fill if v is missing else v for v in raw], dtype=dtype)
+        return kind, array_values, present
+
+
+# ============================================================================
+# Persistence
+# ============================================================================
+
+def _has_non_finite(value) -> bool:
+    """Check whether value holds a NaN or infinite float anywhere"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def _dumps(data: Dict, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, compact unless indent is set, with orjson when available"""
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:  # e.g. integers beyond 64 bits
+            pass
+        else:
+            # orjson writes NaN and +-Infinity as null; only then look for them
+            if b"null" not in encoded or not _has_non_finite(data):
+                return encoded
+    if indent:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+# 19+ digit numbers may not fit in 64 bits, which orjson would parse as floats
+_LONG_NUMBER = re.compile(rb"\d{19}")
+
+
+def _loads(data: bytes) -> Dict:
+    """Parse JSON bytes, with orjson when it can do so losslessly"""
+    if orjson is not None and _LONG_NUMBER.search(data) is None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:  # e.g. NaN or Infinity written by json
+            pass
+    return json.loads(data)
+
+
+def _read_json(path) -> Dict:
+    """Read and parse a single JSON file"""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+
+def _write_json(path: Path, data: Dict):
+    """Write compact JSON via a temp file and atomic rename, so readers never see a partial file"""
+    # Created like open() would (0666 less the umask), unlike NamedTemporaryFile's 0600
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_dumps(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 # ============================================================================
 # Schema Registry
 # ============================================================================
@@ -109,6 +280,9 @@ class SchemaRegistry:
         self.schema_dir = storage_dir / "schemas"
         self.schema_dir.mkdir(parents=True, exist_ok=True)
         self.schemas: Dict[str, NodeSchema] = {}
+        # Memoized hierarchy per class; cleared whenever classes change
+        self._hierarchies: Dict[str, List[str]] = {}
+        self._ancestors: Dict[str, frozenset] = {}
         self._init_thing_schema()
         self._load_schemas()
     
@@ -129,17 +303,13 @@ class SchemaRegistry:
     
     def _save_schema(self, schema: NodeSchema):
         """Save schema to disk"""
-        schema_path = self.schema_dir / f"{schema.class_name}.json"
-        with open(schema_path, 'w') as f:
-            json.dump(schema.to_dict(), f, indent=2)
+        _write_json(self.schema_dir / f"{schema.class_name}.json", schema.to_dict())
     
     def _load_schemas(self):
         """Load all schemas from disk"""
         for schema_file in self.schema_dir.glob("*.json"):
-            with open(schema_file, 'r') as f:
-                data = json.load(f)
-                schema = NodeSchema.from_dict(data)
-                self.schemas[schema.class_name] = schema
+            schema = NodeSchema.from_dict(_read_json(schema_file))
+            self.schemas[schema.class_name] = schema
     
     def register_class(self, class_name: str, parent_class: str = "Thing",
                       attributes: Optional[Dict[str, str]] = None,
@@ -159,6 +329,8 @@ class SchemaRegistry:
         )
         
         self.schemas[class_name] = schema
+        self._hierarchies.clear()
+        self._ancestors.clear()
         self._save_schema(schema)
         logger.info(f"Registered class: {class_name}")
         return schema
@@ -171,23 +343,41 @@ class SchemaRegistry:
         """Get all registered schemas"""
         return self.schemas.copy()
     
+    def reset(self, schemas: Optional[Dict[str, NodeSchema]] = None):
+        """Keep only the given classes in memory (default: just Thing); schema files are left as they are"""
+        kept = dict(schemas) if schemas is not None else {"Thing": self.schemas["Thing"]}
+        self.schemas.clear()
+        self.schemas.update(kept)
+        self._hierarchies.clear()
+        self._ancestors.clear()
+    
     def get_class_hierarchy(self, class_name: str) -> List[str]:
         """Get class hierarchy from child to root"""
-        hierarchy = [class_name]
-        current = class_name
-        
-        while current:
-            schema = self.schemas.get(current)
-            if not schema or not schema.parent_class:
-                break
-            hierarchy.append(schema.parent_class)
-            current = schema.parent_class
+        hierarchy = self._hierarchies.get(class_name)
+        if hierarchy is None:
+            hierarchy = [class_name]
+            current = class_name
+            
+            while current:
+                schema = self.schemas.get(current)
+                if not schema or not schema.parent_class:
+                    break
+                hierarchy.append(schema.parent_class)
+                current = schema.parent_class
+            
+            if class_name in self.schemas:
+                self._hierarchies[class_name] = hierarchy
         
-        return hierarchy
+        return list(hierarchy)
     
     def is_subclass_of(self, child: str, parent: str) -> bool:
         """Check if child is a subclass of parent"""
-        return parent in self.get_class_hierarchy(child)
+        ancestors = self._ancestors.get(child)
+        if ancestors is None:
+            ancestors = frozenset(self.get_class_hierarchy(child))
+            if child in self.schemas:
+                self._ancestors[child] = ancestors
+        return parent in ancestors
 
 
 # ============================================================================
@@ -207,8 +397,38 @@ class GraphStore:
         self.schema_registry = SchemaRegistry(storage_dir)
         self.nodes: Dict[str, Node] = {}
         self.edges: Dict[str, Edge] = {}
+        # Class and name indexes: class_name / name -> {node_id: node}
+        self._by_class: Dict[str, Dict[str, Node]] = {}
+        self._by_name: Dict[str, Dict[str, Node]] = {}
+        # Adjacency index: node_id -> {edge_id: edge}, outgoing and incoming
+        self._out: Dict[str, Dict[str, Edge]] = {}
+        self._in: Dict[str, Dict[str, Edge]] = {}
+        # Same edges keyed by (node_id, edge_type) for typed lookups
+        self._out_typed: Dict[Tuple[str, str], Dict[str, Edge]] = {}
+        self._in_typed: Dict[Tuple[str, str], Dict[str, Edge]] = {}
+        # Cached (neighbour_ids, edge_types) tuples per node, dropped on change
+        self._out_arrays: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._in_arrays: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        # Integer code per edge type, assigned when first indexed and never reused
+        self._etype_codes: Dict[str, int] = {}
+        # Bumped on every mutation so derived caches can detect staleness
+        self._version = 0
+        # (version, CSR) kept in one attribute so threads never pair a CSR with another build's version
+        self._csr: Tuple[int, Optional[CSRAdjacency]] = (-1, None)
+        # Columnar views keyed by class name, None for all nodes
+        self._columns: Dict[Optional[str], AttributeColumns] = {}
+        self._columns_version = -1
+        # Write buffers of the calling thread's open batch(), see _pending_node_writes
+        self._pending = threading.local()
+        # IDs are a random per-instance prefix plus a counter, so only one uuid4() per store
+        self._id_prefix = uuid.uuid4().hex[:12]
+        self._id_counter = itertools.count()
         self._load_graph()
     
+    def _new_id(self) -> str:
+        """Get a unique 16+ hex digit ID suffix for a new node or edge"""
+        return f"{self._id_prefix}{next(self._id_counter):04x}"
+    
     def _get_node_path(self, node_id: str) -> Path:
         """Get path for node storage"""
         return self.nodes_dir / f"{node_id}.json"
@@ -217,51 +437,219 @@ class GraphStore:
         """Get path for edge storage"""
         return self.edges_dir / f"{edge_id}.json"
     
+    @property
+    def _pending_node_writes(self) -> Optional[Dict[str, Node]]:
+        """Node writes buffered by this thread's batch(); None means write-through"""
+        return getattr(self._pending, "nodes", None)
+    
+    @property
+    def _pending_edge_writes(self) -> Optional[Dict[str, Edge]]:
+        """Edge writes buffered by this thread's batch(); None means write-through"""
+        return getattr(self._pending, "edges", None)
+    
     def _save_node(self, node: Node):
         """Save node to disk"""
-        node_path = self._get_node_path(node.node_id)
-        with open(node_path, 'w') as f:
-            json.dump(node.to_dict(), f, indent=2)
+        pending = self._pending_node_writes
+        if pending is not None:
+            pending[node.node_id] = node
+            return
+        _write_json(self._get_node_path(node.node_id), node.to_dict())
     
     def _load_node(self, node_id: str) -> Optional[Node]:
         """Load node from disk"""
         node_path = self._get_node_path(node_id)
         if not node_path.exists():
             return None
-        with open(node_path, 'r') as f:
-            data = json.load(f)
-            return Node.from_dict(data)
+        return Node.from_dict(_read_json(node_path))
+    
+    def _index_node(self, node: Node):
+        """Add node to the class and name indexes"""
+        self._by_class.setdefault(node.class_name, {})[node.node_id] = node
+        self._by_name.setdefault(node.name, {})[node.node_id] = node
+    
+    def _unindex_node(self, node: Node):
+        """Remove node from the class and name indexes"""
+        for index, key in ((self._by_class, node.class_name), (self._by_name, node.name)):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(node.node_id, None)
+                if not bucket:
+                    del index[key]
+    
+    def _index_edge(self, edge: Edge):
+        """Add edge to the adjacency index"""
+        self._out.setdefault(edge.from_node_id, {})[edge.edge_id] = edge
+        self._in.setdefault(edge.to_node_id, {})[edge.edge_id] = edge
+        self._out_typed.setdefault((edge.from_node_id, edge.edge_type), {})[edge.edge_id] = edge
+        self._in_typed.setdefault((edge.to_node_id, edge.edge_type), {})[edge.edge_id] = edge
+        if edge.edge_type not in self._etype_codes:
+            self._etype_codes[edge.edge_type] = len(self._etype_codes)
+        self._out_arrays.pop(edge.from_node_id, None)
+        self._in_arrays.pop(edge.to_node_id, None)
+    
+    def _unindex_edge(self, edge: Edge):
+        """Remove edge from the adjacency index"""
+        self._out_arrays.pop(edge.from_node_id, None)
+        self._in_arrays.pop(edge.to_node_id, None)
+        for index, key in ((self._out, edge.from_node_id),
+                           (self._in, edge.to_node_id),
+                           (self._out_typed, (edge.from_node_id, edge.edge_type)),
+                           (self._in_typed, (edge.to_node_id, edge.edge_type))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(edge.edge_id, None)
+                if not bucket:
+                    del index[key]
+    
+    def get_csr(self) -> CSRAdjacency:
+        """Get CSR adjacency for the current graph version, rebuilding if stale"""
+        # Read the version first: changes made during the build must leave the result stale
+        version = self._version
+        csr_version, csr = self._csr
+        if csr is not None and csr_version == version:
+            return csr
+        
+        node_ids = list(self.nodes)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        type_codes = self._etype_codes
+        indptr = array('i', [0])
+        indices = array('i')
+        etypes = array('h')
+        
+        for node_id in node_ids:
+            for edge in self._out.get(node_id, {}).values():
+                neighbor = index.get(edge.to_node_id)
+                if neighbor is not None:
+                    indices.append(neighbor)
+                    etypes.append(type_codes[edge.edge_type])
+            for edge in self._in.get(node_id, {}).values():
+                neighbor = index.get(edge.from_node_id)
+                if neighbor is not None:
+                    indices.append(neighbor)
+                    etypes.append(type_codes[edge.edge_type])
+            indptr.append(len(indices))
+        
+        csr = CSRAdjacency(node_ids, index, indptr, indices, etypes, dict(type_codes))
+        self._csr = (version, csr)
+        return csr
+    
+    def get_columns(self, class_name: Optional[str] = None) -> AttributeColumns:
+        """Get columnar attribute view of all nodes, or of one class, for the current graph version (requires numpy)"""
+        if self._columns_version != self._version:
+            self._columns.clear()
+            self._columns_version = self._version
+        
+        columns = self._columns.get(class_name)
+        if columns is None:
+            nodes = self.nodes if class_name is None else self._by_class.get(class_name, {})
+            columns = self._columns[class_name] = AttributeColumns(list(nodes.values()))
+        return columns
     
     def _save_edge(self, edge: Edge):
         """Save edge to disk"""
-        edge_path = self._get_edge_path(edge.edge_id)
-        with open(edge_path, 'w') as f:
-            json.dump(edge.to_dict(), f, indent=2)
+        pending = self._pending_edge_writes
+        if pending is not None:
+            pending[edge.edge_id] = edge
+            return
+        _write_json(self._get_edge_path(edge.edge_id), edge.to_dict())
     
     def _load_edge(self, edge_id: str) -> Optional[Edge]:
         """Load edge from disk"""
         edge_path = self._get_edge_path(edge_id)
         if not edge_path.exists():
             return None
-        with open(edge_path, 'r') as f:
-            data = json.load(f)
-            return Edge.from_dict(data)
+        return Edge.from_dict(_read_json(edge_path))
+    
+    @contextmanager
+    def batch(self):
+        """
+        Defer node/edge writes until the end of the block
+        
+        Writes issued inside the block are collected per entity and flushed
+        once on exit, so repeated updates of the same node hit the disk only
+        once. Nested batches join the outermost one; flush() writes out what
+        has been collected so far. Batches are per thread: writes from other
+        threads stay write-through or go to their own batch.
+        """
+        if self._pending_node_writes is not None:
+            yield self
+            return
+        
+        self._pending.nodes = {}
+        self._pending.edges = {}
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._pending.nodes = None
+                self._pending.edges = None
+    
+    def flush(self):
+        """Write node/edge changes buffered by this thread's open batch() to disk"""
+        pending_nodes = self._pending_node_writes
+        if pending_nodes is None:
+            return
+        pending_edges = self._pending_edge_writes
+        # Entities deleted meanwhile, possibly by another thread, are skipped
+        while pending_nodes:
+            node_id, node = pending_nodes.popitem()
+            if self.nodes.get(node_id) is node:
+                _write_json(self._get_node_path(node_id), node.to_dict())
+        while pending_edges:
+            edge_id, edge = pending_edges.popitem()
+            if self.edges.get(edge_id) is edge:
+                _write_json(self._get_edge_path(edge_id), edge.to_dict())
+    
+    def reset(self):
+        """Remove all nodes and edges from memory and disk; schemas are kept"""
+        for directory in (self.nodes_dir, self.edges_dir):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        os.unlink(entry.path)
+        
+        self.nodes.clear()
+        self.edges.clear()
+        self._by_class.clear()
+        self._by_name.clear()
+        self._out.clear()
+        self._in.clear()
+        self._out_typed.clear()
+        self._in_typed.clear()
+        self._out_arrays.clear()
+        self._in_arrays.clear()
+        if self._pending_node_writes is not None:
+            self._pending_node_writes.clear()
+            self._pending_edge_writes.clear()
+        self._version += 1
+    
+    def _read_json_files(self, directory: Path) -> List[Dict]:
+        """Read and parse all JSON files in a directory, overlapping file I/O"""
+        # scandir lists names without building a Path per entry; an empty store costs one call
+        with os.scandir(directory) as entries:
+            files = [entry.path for entry in entries if entry.name.endswith(".json")]
+        if len(files) < 2:
+            return [_read_json(path) for path in files]
+        
+        max_workers = min(len(files), (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_read_json, files))
     
     def _load_graph(self):
         """Load entire graph from disk"""
         # Load nodes
-        for node_file in self.nodes_dir.glob("*.json"):
-            with open(node_file, 'r') as f:
-                data = json.load(f)
-                node = Node.from_dict(data)
-                self.nodes[node.node_id] = node
+        for data in self._read_json_files(self.nodes_dir):
+            node = Node.from_dict(data)
+            self.nodes[node.node_id] = node
+            self._index_node(node)
         
         # Load edges
-        for edge_file in self.edges_dir.glob("*.json"):
-            with open(edge_file, 'r') as f:
-                data = json.load(f)
-                edge = Edge.from_dict(data)
-                self.edges[edge.edge_id] = edge
+        for data in self._read_json_files(self.edges_dir):
+            edge = Edge.from_dict(data)
+            self.edges[edge.edge_id] = edge
+            self._index_edge(edge)
     
     def create_node(self, class_name: str, name: str,
                    attributes: Optional[Dict[str, Any]] = None) -> Node:
@@ -270,7 +658,7 @@ class GraphStore:
         if not schema:
             raise ValueError(f"Unknown class: {class_name}")
         
-        node_id = f"{class_name}:{uuid.uuid4().hex[:16]}"
+        node_id = f"{class_name}:{self._new_id()}"
         timestamp = datetime.utcnow().isoformat()
         
         node = Node(
@@ -283,6 +671,8 @@ class GraphStore:
         )
         
         self.nodes[node_id] = node
+        self._index_node(node)
+        self._version += 1
         self._save_node(node)
         logger.info(f"Created node: {node_id}")
         return node
@@ -298,12 +688,15 @@ class GraphStore:
         if not node:
             return None
         
-        if name:
+        if name and name != node.name:
+            self._unindex_node(node)
             node.name = name
+            self._index_node(node)
         if attributes:
             node.attributes.update(attributes)
         
         node.updated_at = datetime.utcnow().isoformat()
+        self._version += 1
         self._save_node(node)
         logger.info(f"Updated node: {node_id}")
         return node
@@ -313,17 +706,18 @@ class GraphStore:
         if node_id not in self.nodes:
             return False
         
-        # Delete all edges connected to this node
-        edges_to_delete = [
-            edge_id for edge_id, edge in self.edges.items()
-            if edge.from_node_id == node_id or edge.to_node_id == node_id
-        ]
+        # Delete all edges connected to this node (a self-loop is in both maps)
+        edges_to_delete = set(self._out.get(node_id, ())) | set(self._in.get(node_id, ()))
         
         for edge_id in edges_to_delete:
             self.delete_edge(edge_id)
         
         # Delete node
-        del self.nodes[node_id]
+        node = self.nodes.pop(node_id)
+        self._unindex_node(node)
+        self._version += 1
+        if self._pending_node_writes is not None:
+            self._pending_node_writes.pop(node_id, None)
         node_path = self._get_node_path(node_id)
         if node_path.exists():
             node_path.unlink()
@@ -340,7 +734,7 @@ class GraphStore:
         if to_node_id not in self.nodes:
             raise ValueError(f"Target node {to_node_id} not found")
         
-        edge_id = f"{from_node_id}_{edge_type}_{to_node_id}:{uuid.uuid4().hex[:8]}"
+        edge_id = f"{from_node_id}_{edge_type}_{to_node_id}:{self._new_id()}"
         timestamp = datetime.utcnow().isoformat()
         
         edge = Edge(
@@ -353,6 +747,8 @@ class GraphStore:
         )
         
         self.edges[edge_id] = edge
+        self._index_edge(edge)
+        self._version += 1
         self._save_edge(edge)
         logger.info(f"Created edge: {edge_id}")
         return edge
@@ -366,7 +762,11 @@ class GraphStore:
         if edge_id not in self.edges:
             return False
         
-        del self.edges[edge_id]
+        edge = self.edges.pop(edge_id)
+        self._unindex_edge(edge)
+        self._version += 1
+        if self._pending_edge_writes is not None:
+            self._pending_edge_writes.pop(edge_id, None)
         edge_path = self._get_edge_path(edge_id)
         if edge_path.exists():
             edge_path.unlink()
@@ -376,27 +776,31 @@ class GraphStore:
     
     def get_outgoing_edges(self, node_id: str, edge_type: Optional[str] = None) -> List[Edge]:
         """Get all outgoing edges from a node"""
-        edges = [
-            edge for edge in self.edges.values()
-            if edge.from_node_id == node_id
-        ]
-        
-        if edge_type:
-            edges = [e for e in edges if e.edge_type == edge_type]
-        
-        return edges
+        edges = self._out_typed.get((node_id, edge_type)) if edge_type else self._out.get(node_id)
+        return list(edges.values()) if edges else []
     
     def get_incoming_edges(self, node_id: str, edge_type: Optional[str] = None) -> List[Edge]:
         """Get all incoming edges to a node"""
-        edges = [
-            edge for edge in self.edges.values()
-            if edge.to_node_id == node_id
-        ]
-        
-        if edge_type:
-            edges = [e for e in edges if e.edge_type == edge_type]
-        
-        return edges
+        edges = self._in_typed.get((node_id, edge_type)) if edge_type else self._in.get(node_id)
+        return list(edges.values()) if edges else []
+    
+    def get_out_neighbors_arrays(self, node_id: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Get (target node IDs, edge types) of a node's outgoing edges as parallel tuples"""
+        arrays = self._out_arrays.get(node_id)
+        if arrays is None:
+            edges = self._out.get(node_id, {}).values()
+            arrays = (tuple(e.to_node_id for e in edges), tuple(e.edge_type for e in edges))
+            self._out_arrays[node_id] = arrays
+        return arrays
+    
+    def get_in_neighbors_arrays(self, node_id: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Get (source node IDs, edge types) of a node's incoming edges as parallel tuples"""
+        arrays = self._in_arrays.get(node_id)
+        if arrays is None:
+            edges = self._in.get(node_id, {}).values()
+            arrays = (tuple(e.from_node_id for e in edges), tuple(e.edge_type for e in edges))
+            self._in_arrays[node_id] = arrays
+        return arrays
     
     def get_parent_classes(self, node_id: str) -> List[Node]:
         """Get parent classes via is_a edges"""
@@ -415,11 +819,11 @@ class GraphStore:
     
     def find_nodes_by_class(self, class_name: str) -> List[Node]:
         """Find all nodes of a specific class"""
-        return [node for node in self.nodes.values() if node.class_name == class_name]
+        return list(self._by_class.get(class_name, {}).values())
     
     def find_nodes_by_name(self, name: str) -> List[Node]:
         """Find all nodes with a specific name"""
-        return [node for node in self.nodes.values() if node.name == name]
+        return list(self._by_name.get(name, {}).values())
     
     def traverse_is_a_hierarchy(self, node_id: str) -> List[Node]:
         """Traverse is_a hierarchy upwards"""
@@ -474,10 +878,60 @@ class GraphStore:
 # Graph Query Engine
 # ============================================================================
 
+# Sentinel for absent attributes; None is a legitimate attribute value
+_MISSING = object()
+
+
+def _is_number(value: Any) -> bool:
+    """Check for int/float values, excluding bool"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_exact_number(value: Any) -> bool:
+    """Check for numbers numpy compares with int/float columns exactly as Python does"""
+    return _is_number(value) and (isinstance(value, float) or -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT)
+
+
+def _is_plain_str(value: Any) -> bool:
+    """Check for strings numpy compares with str columns exactly as Python does"""
+    return isinstance(value, str) and "\x00" not in value
+
+
+def _op_in(node_value: Any, value: Any) -> bool:
+    """Check if node_value is in the list/set"""
+    return node_value in value
+
+
+def _op_contains(node_value: Any, value: Any) -> bool:
+    """Check if value is substring of node_value (for strings)"""
+    return isinstance(node_value, str) and isinstance(value, str) and value in node_value
+
+
 class AttributeFilter:
-    """Filter for node attributes"""
-    
-    OPERATORS = {"==", "<=", ">=", "!=", "<", ">", "in", "contains"}
+    """
+    Filter for node attributes
+    
+    Filters are immutable: expressions compile and cache results per filter
+    state, so attribute, operator and value are read-only. List and set
+    values are stored as tuple and frozenset.
+    """
+    
+    __slots__ = ("_attribute", "_operator", "_value", "_op", "_memo")
+    
+    _OPS = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<=": operator.le,
+        ">=": operator.ge,
+        "<": operator.lt,
+        ">": operator.gt,
+        "in": _op_in,
+        "contains": _op_contains,
+    }
+    OPERATORS = set(_OPS)
+    # Operators whose results are memoized per attribute value
+    _MEMO_OPERATORS = {"in", "contains"}
+    MEMO_SIZE = 4096
     
     def __init__(self, attribute: str, operator: str, value: Any):
         """
@@ -491,43 +945,123 @@ class AttributeFilter:
         if operator not in self.OPERATORS:
             raise ValueError(f"Unsupported operator: {operator}")
         
-        self.attribute = attribute
-        self.operator = operator
-        self.value = value
+        if isinstance(value, list):
+            value = tuple(value)
+        elif isinstance(value, set):
+            value = frozenset(value)
+        
+        self._attribute = attribute
+        self._operator = operator
+        self._value = value
+        # Comparison function resolved once instead of per match
+        self._op = self._OPS[operator]
+        self._memo: Optional[Dict[Any, bool]] = {} if operator in self._MEMO_OPERATORS else None
+    
+    @property
+    def attribute(self) -> str:
+        return self._attribute
+    
+    @property
+    def operator(self) -> str:
+        return self._operator
+    
+    @property
+    def value(self) -> Any:
+        return self._value
+    
+    def clear_cache(self):
+        """Forget memoized results"""
+        if self._memo is not None:
+            self._memo.clear()
     
     def matches(self, node: Node) -> bool:
         """Check if node matches this filter"""
-        if self.attribute not in node.attributes:
-            return False
-        
-        node_value = node.attributes[self.attribute]
-        
-        if self.operator == "==":
-            return node_value == self.value
-        elif self.operator == "!=":
-            return node_value != self.value
-        elif self.operator == "<=":
-            return node_value <= self.value
-        elif self.operator == ">=":
-            return node_value >= self.value
-        elif self.operator == "<":
-            return node_value < self.value
-        elif self.operator == ">":
-            return node_value > self.value
-        elif self.operator == "in":
-            # Check if node_value is in the list/set
-            return node_value in self.value
-        elif self.operator == "contains":
-            # Check if value is substring of node_value (for strings)
-            if isinstance(node_value, str) and isinstance(self.value, str):
-                return self.value in node_value
+        node_value = node.attributes.get(self._attribute, _MISSING)
+        if node_value is _MISSING:
             return False
         
-        return False
+        memo = self._memo
+        if memo is None:
+            return self._op(node_value, self._value)
+        
+        # The result depends only on the attribute value, so it can be reused
+        # across nodes and graph versions
+        try:
+            return memo[node_value]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable value
+            return self._op(node_value, self._value)
+        
+        result = self._op(node_value, self._value)
+        if len(memo) < self.MEMO_SIZE:
+            memo[node_value] = result
+        return result
+    
+    def as_mask(self, columns: AttributeColumns):
+        """Evaluate this filter over all nodes of a columnar view as a bool array"""
+        kind, values, present = columns.column(self.attribute)
+        value = self.value
+        
+        if kind in ("int", "float"):
+            if self.operator == "contains":
+                return np.zeros(len(columns), dtype=np.bool_)
+            if self.operator == "in":
+                if isinstance(value, (tuple, frozenset)) and all(_is_exact_number(v) for v in value):
+                    return np.isin(values, list(value)) & present
+            elif _is_exact_number(value):
+                return self._op(values, value) & present
+        elif kind == "str":
+            if self.operator == "contains":
+                if _is_plain_str(value):
+                    return (np.char.find(values, value) >= 0) & present
+                if not isinstance(value, str):
+                    return np.zeros(len(columns), dtype=np.bool_)
+            elif self.operator == "in":
+                if isinstance(value, (tuple, frozenset)) and all(_is_plain_str(v) for v in value):
+                    return np.isin(values, list(value)) & present
+            elif _is_plain_str(value):
+                return self._op(values, value) & present
+        
+        # Mixed or incompatible types: evaluate row by row
+        return np.fromiter((self.matches(node) for node in columns.nodes),
+                           dtype=np.bool_, count=len(columns))
+
+
+class _MultiContainsFilter:
+    """Several 'contains' filters on one attribute, OR-ed and scanned in a single pass"""
+    
+    __slots__ = ("attribute", "patterns", "_search")
+    operator = "contains"
+    
+    def __init__(self, attribute: str, patterns: List[str]):
+        self.attribute = attribute
+        self.patterns = patterns
+        # Longest first so the alternation never stops at a shorter prefix
+        alternation = "|".join(re.escape(p) for p in sorted(set(patterns), key=len, reverse=True))
+        self._search = re.compile(alternation).search
+    
+    def matches(self, node: Node) -> bool:
+        node_value = node.attributes.get(self.attribute)
+        return isinstance(node_value, str) and self._search(node_value) is not None
 
 
 class FilterExpression:
-    """Composite filter expression (AND/OR logic)"""
+    """
+    Composite filter expression (AND/OR logic)
+    
+    The filter tuple and operator are read-only, so the plan compiled on
+    first use always matches the expression; extend it with add_filter().
+    """
+    
+    __slots__ = ("_filters", "_operator", "_optimized", "_plan", "_match")
+    
+    # Relative evaluation cost per operator; cheap comparisons run first
+    _COST = {"==": 0, "!=": 0, "<": 0, "<=": 0, ">": 0, ">=": 0, "in": 2, "contains": 3}
+    # Operators inlined as Python syntax by compile()
+    _INLINE_OPS = {"==", "!=", "<", "<=", ">", ">="}
+    # Below this many filters, the plain loop is as fast as a compiled expression
+    COMPILE_THRESHOLD = 2
     
     def __init__(self, filters: List[AttributeFilter] = None, operator: str = "AND"):
         """
@@ -540,30 +1074,227 @@ class FilterExpression:
         if operator not in ("AND", "OR"):
             raise ValueError("Operator must be AND or OR")
         
-        self.filters = filters or []
-        self.operator = operator
+        self._filters: Tuple[AttributeFilter, ...] = tuple(filters) if filters else ()
+        self._operator = operator
+        self._optimized = False
+        # Filters actually evaluated by matches(), built by optimize()
+        self._plan: Sequence[AttributeFilter] = self._filters
+        # AND/OR branch resolved once instead of per match
+        self._match = self._match_and if operator == "AND" else self._match_or
+    
+    @property
+    def filters(self) -> Tuple[AttributeFilter, ...]:
+        return self._filters
+    
+    @property
+    def operator(self) -> str:
+        return self._operator
     
     def add_filter(self, attribute_filter: AttributeFilter) -> 'FilterExpression':
         """Add a filter to the expression"""
-        self.filters.append(attribute_filter)
+        self._filters += (attribute_filter,)
+        self._optimized = False
+        return self
+    
+    def optimize(self) -> 'FilterExpression':
+        """Reorder filters so cheap comparisons are evaluated before costly ones"""
+        self._filters = tuple(sorted(self._filters, key=lambda f: self._COST.get(f.operator, 1)))
+        self._plan = self._fuse_contains() if self.operator == "OR" else self.filters
+        if len(self._plan) >= self.COMPILE_THRESHOLD:
+            self._match = self.compile()
+        else:
+            self._match = self._match_and if self.operator == "AND" else self._match_or
+        self._optimized = True
         return self
     
+    def compile(self) -> Callable[[Node], bool]:
+        """
+        Build a single function evaluating the whole plan
+        
+        Plain comparisons are inlined into one boolean expression; memoized
+        and fused filters are called through their matches(). Attribute names
+        and values are bound as variables, never pasted into the source.
+        
+        Returns:
+            Function taking a node and returning whether it matches
+        """
+        namespace: Dict[str, Any] = {"_MISSING": _MISSING}
+        terms = []
+        for i, f in enumerate(self._plan):
+            if type(f) is not AttributeFilter or f.operator not in self._INLINE_OPS:
+                namespace[f"m{i}"] = f.matches
+                terms.append(f"m{i}(node)")
+            else:
+                namespace[f"k{i}"] = f.attribute
+                namespace[f"c{i}"] = f.value
+                terms.append(f"((v{i} := get(k{i}, _MISSING)) is not _MISSING and v{i} {f.operator} c{i})")
+        joiner = " and " if self.operator == "AND" else " or "
+        source = f"def _compiled(node):\n    get = node.attributes.get\n    return bool({joiner.join(terms)})\n"
+        exec(compile(source, "<FilterExpression>", "exec"), namespace)
+        return namespace["_compiled"]
+    
+    def _fuse_contains(self) -> List[AttributeFilter]:
+        """Merge OR-ed string 'contains' filters on the same attribute into one scan"""
+        def fusable(f):
+            return f.operator == "contains" and isinstance(f.value, str) and f.value != ""
+        
+        groups: Dict[str, List[str]] = {}
+        for f in self.filters:
+            if fusable(f):
+                groups.setdefault(f.attribute, []).append(f.value)
+        
+        plan = []
+        fused = set()
+        for f in self.filters:
+            if not fusable(f) or len(groups[f.attribute]) < 2:
+                plan.append(f)
+            elif f.attribute not in fused:
+                fused.add(f.attribute)
+                plan.append(_MultiContainsFilter(f.attribute, groups[f.attribute]))
+        return plan
+    
+    def cache_key(self) -> Optional[Tuple]:
+        """Hashable signature of this expression, or None if it has none"""
+        parts = []
+        for f in self.filters:
+            if isinstance(f, FilterExpression):
+                nested = f.cache_key()
+                if nested is None:
+                    return None
+                parts.append(nested)
+                continue
+            if not isinstance(f, AttributeFilter):
+                return None
+            parts.append((f.attribute, f.operator, f.value))
+        key = (self.operator, tuple(parts))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def as_mask(self, columns: AttributeColumns):
+        """Evaluate this expression over all nodes of a columnar view as a bool array"""
+        if not self.filters:
+            return np.ones(len(columns), dtype=np.bool_)
+        
+        masks = [_as_mask(f, columns) for f in self.filters]
+        if self.operator == "AND":
+            return np.logical_and.reduce(masks)
+        return np.logical_or.reduce(masks)
+    
     def matches(self, node: Node) -> bool:
         """Check if node matches this expression"""
-        if not self.filters:
+        if not self._filters:
             return True
         
-        if self.operator == "AND":
-            return all(f.matches(node) for f in self.filters)
-        else:  # OR
-            return any(f.matches(node) for f in self.filters)
+        if not self._optimized:
+            self.optimize()
+        
+        return self._match(node)
+    
+    def _match_and(self, node: Node) -> bool:
+        for f in self._plan:
+            if not f.matches(node):
+                return False
+        return True
+    
+    def _match_or(self, node: Node) -> bool:
+        for f in self._plan:
+            if f.matches(node):
+                return True
+        return False
+
+
+def _as_mask(attribute_filter, columns: AttributeColumns):
+    """Mask of a member filter, evaluated row by row if it only provides matches()"""
+    as_mask = getattr(attribute_filter, "as_mask", None)
+    if as_mask is not None:
+        return as_mask(columns)
+    return np.fromiter((attribute_filter.matches(node) for node in columns.nodes),
+                       dtype=np.bool_, count=len(columns))
+
+
+def _chunk_match(chunk: List[Node], attribute_filter: FilterExpression) -> List[Node]:
+    """Filter one shard of nodes"""
+    return [node for node in chunk if attribute_filter.matches(node)]
+
+
+def _bfs_csr(indptr, indices, etypes, excluded: Set[int], start: int, max_depth: int) -> List[int]:
+    """
+    Level-synchronous BFS over CSR arrays
+    
+    Returns node indices in discovery order, which matches the
+    outgoing-then-incoming order of the edge lists.
+    """
+    visited = bytearray(len(indptr) - 1)
+    visited[start] = 1
+    order = [start]
+    frontier = [start]
+    depth = 0
+    
+    while frontier and (max_depth < 0 or depth < max_depth):
+        next_frontier = []
+        for u in frontier:
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if visited[v] or etypes[k] in excluded:
+                    continue
+                visited[v] = 1
+                next_frontier.append(v)
+        order.extend(next_frontier)
+        frontier = next_frontier
+        depth += 1
+    
+    return order
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _bfs_csr_jit(indptr, indices, etypes, excluded_mask, start, max_depth):
+        """Native-code variant of _bfs_csr; excluded_mask is indexed by edge type code"""
+        n = indptr.shape[0] - 1
+        visited = np.zeros(n, np.bool_)
+        depth = np.zeros(n, np.int32)
+        queue = np.empty(n, np.int32)
+        queue[0] = start
+        visited[start] = True
+        head = 0
+        tail = 1
+        
+        while head < tail:
+            u = queue[head]
+            head += 1
+            if max_depth >= 0 and depth[u] >= max_depth:
+                continue
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if visited[v] or excluded_mask[etypes[k]]:
+                    continue
+                visited[v] = True
+                depth[v] = depth[u] + 1
+                queue[tail] = v
+                tail += 1
+        
+        return queue[:tail]
+else:
+    _bfs_csr_jit = None
 
 
 class GraphFilter:
     """Graph filtering engine"""
     
+    TRAVERSAL_CACHE_SIZE = 128
+    PARALLEL_FILTER_THRESHOLD = 10000  # below this, thread overhead outweighs the gain
+    VECTORIZE_THRESHOLD = 32  # below this, building masks costs more than matching row by row
+    
     def __init__(self, graph_store: GraphStore):
         self.graph = graph_store
+        # LRU of traverse_with_filter results, valid for one graph version
+        self._traverse_cache: "OrderedDict[Tuple, List[Node]]" = OrderedDict()
+        self._cache_version = -1
+        # API request threads share one GraphFilter
+        self._cache_lock = threading.Lock()
     
     def get_connected_nodes(self, node_id: str, exclude_edge_types: Optional[List[str]] = None,
                            attribute_filter: Optional[FilterExpression] = None) -> List[Node]:
@@ -578,31 +1309,40 @@ class GraphFilter:
         Returns:
             List of connected nodes matching criteria
         """
+        return list(self.iter_connected_nodes(node_id, exclude_edge_types, attribute_filter))
+    
+    def iter_connected_nodes(self, node_id: str, exclude_edge_types: Optional[List[str]] = None,
+                             attribute_filter: Optional[FilterExpression] = None) -> Iterator[Node]:
+        """Lazily yield the nodes get_connected_nodes would return"""
         if node_id not in self.graph.nodes:
-            return []
-        
-        exclude_types = exclude_edge_types or []
-        connected = set()
-        
-        # Get all outgoing edges
-        for edge in self.graph.get_outgoing_edges(node_id):
-            if edge.edge_type not in exclude_types:
-                connected.add(edge.to_node_id)
-        
-        # Get all incoming edges
-        for edge in self.graph.get_incoming_edges(node_id):
-            if edge.edge_type not in exclude_types:
-                connected.add(edge.from_node_id)
+            return
+        
+        exclude_types = frozenset(exclude_edge_types or ())
+        match = attribute_filter.matches if attribute_filter is not None else None
+        nodes = self.graph.nodes
+        
+        if not exclude_types and match is None:
+            # Common case: no per-edge checks, so dedup all neighbour IDs in one C-level pass
+            out_ids = self.graph.get_out_neighbors_arrays(node_id)[0]
+            in_ids = self.graph.get_in_neighbors_arrays(node_id)[0]
+            for neighbor_id in dict.fromkeys(out_ids + in_ids):
+                node = nodes.get(neighbor_id)
+                if node is not None:
+                    yield node
+            return
         
-        # Convert to nodes and apply attribute filter
-        result = []
-        for node_id_item in connected:
-            node = self.graph.get_node(node_id_item)
-            if node:
-                if attribute_filter is None or attribute_filter.matches(node):
-                    result.append(node)
+        visited = set()
         
-        return result
+        # Resolve, dedup and filter each neighbour as soon as it is seen
+        for neighbor_ids, edge_types in (self.graph.get_out_neighbors_arrays(node_id),
+                                         self.graph.get_in_neighbors_arrays(node_id)):
+            for neighbor_id, edge_type in zip(neighbor_ids, edge_types):
+                if edge_type in exclude_types or neighbor_id in visited:
+                    continue
+                visited.add(neighbor_id)
+                node = nodes.get(neighbor_id)
+                if node is not None and (match is None or match(node)):
+                    yield node
     
     def get_connected_nodes_excluding_is_a(self, node_id: str,
                                           attribute_filter: Optional[FilterExpression] = None) -> List[Node]:
@@ -634,43 +1374,81 @@ class GraphFilter:
         Returns:
             List of all reachable nodes matching criteria
         """
-        from collections import deque
-        
         if start_node_id not in self.graph.nodes:
             return []
         
-        exclude_types = exclude_edge_types or []
-        visited = set()
-        result = []
-        queue = deque([(start_node_id, 0)])
+        if attribute_filter is None:
+            filter_key = ()
+        else:
+            # Any object with matches() is accepted; only cacheable filters provide a key
+            cache_key = getattr(attribute_filter, "cache_key", None)
+            filter_key = cache_key() if cache_key is not None else None
+        if filter_key is None:
+            return list(self.iter_traverse_with_filter(start_node_id, exclude_edge_types,
+                                                       attribute_filter, max_depth))
+        
+        key = (start_node_id, frozenset(exclude_edge_types or ()), filter_key, max_depth)
+        version = self.graph._version
+        with self._cache_lock:
+            if self._cache_version != version:
+                self._traverse_cache.clear()
+                self._cache_version = version
+            cached = self._traverse_cache.get(key)
+            if cached is not None:
+                self._traverse_cache.move_to_end(key)
+                return list(cached)
+        
+        result = list(self.iter_traverse_with_filter(start_node_id, exclude_edge_types,
+                                                     attribute_filter, max_depth))
+        with self._cache_lock:
+            # Only cache results computed against the version the cache holds
+            if self._cache_version == version:
+                self._traverse_cache[key] = result
+                if len(self._traverse_cache) > self.TRAVERSAL_CACHE_SIZE:
+                    self._traverse_cache.popitem(last=False)
+        return list(result)
+    
+    def iter_traverse_with_filter(self, start_node_id: str,
+                                  exclude_edge_types: Optional[List[str]] = None,
+                                  attribute_filter: Optional[FilterExpression] = None,
+                                  max_depth: int = -1) -> Iterator[Node]:
+        """
+        Lazily yield the nodes traverse_with_filter would return
         
-        while queue:
-            current_id, depth = queue.popleft()
-            
-            if current_id in visited:
-                continue
-            
-            if max_depth >= 0 and depth > max_depth:
+        Reachable node indices are collected up front; nodes are resolved and
+        the attribute filter is evaluated only as results are consumed.
+        Results are not cached.
+        """
+        if start_node_id not in self.graph.nodes:
+            return
+        
+        csr = self.graph.get_csr()
+        excluded = {csr.type_codes[t] for t in (exclude_edge_types or ()) if t in csr.type_codes}
+        indptr, indices, etypes = csr.indptr, csr.indices, csr.etypes
+        
+        start = csr.index[start_node_id]
+        if _bfs_csr_jit is not None:
+            excluded_mask = np.zeros(max(len(csr.type_codes), 1), dtype=np.bool_)
+            for code in excluded:
+                excluded_mask[code] = True
+            order = _bfs_csr_jit(
+                np.frombuffer(indptr, dtype=np.intc),
+                np.frombuffer(indices, dtype=np.intc),
+                np.frombuffer(etypes, dtype=np.short),
+                excluded_mask, start, max_depth
+            ).tolist()
+        else:
+            order = _bfs_csr(indptr, indices, etypes, excluded, start, max_depth)
+        
+        nodes = self.graph.nodes
+        node_ids = csr.node_ids
+        for i in order:
+            # Nodes deleted while the caller consumes results are skipped
+            node = nodes.get(node_ids[i])
+            if node is None:
                 continue
-            
-            visited.add(current_id)
-            node = self.graph.get_node(current_id)
-            
-            if node:
-                # Apply filter
-                if attribute_filter is None or attribute_filter.matches(node):
-                    result.append(node)
-                
-                # Add neighbors to queue
-                for edge in self.graph.get_outgoing_edges(current_id):
-                    if edge.edge_type not in exclude_types and edge.to_node_id not in visited:
-                        queue.append((edge.to_node_id, depth + 1))
-                
-                for edge in self.graph.get_incoming_edges(current_id):
-                    if edge.edge_type not in exclude_types and edge.from_node_id not in visited:
-                        queue.append((edge.from_node_id, depth + 1))
-        
-        return result
+            if attribute_filter is None or attribute_filter.matches(node):
+                yield node
     
     def filter_nodes_by_class(self, class_name: str,
                              attribute_filter: Optional[FilterExpression] = None) -> List[Node]:
@@ -684,12 +1462,17 @@ class GraphFilter:
         Returns:
             List of matching nodes
         """
-        nodes = self.graph.find_nodes_by_class(class_name)
-        
         if attribute_filter is None:
-            return nodes
+            return self.graph.find_nodes_by_class(class_name)
+        
+        if (np is None or len(self.graph._by_class.get(class_name, ())) < self.VECTORIZE_THRESHOLD
+                or not hasattr(attribute_filter, "as_mask")):
+            return [node for node in self.graph.find_nodes_by_class(class_name) if attribute_filter.matches(node)]
         
-        return [node for node in nodes if attribute_filter.matches(node)]
+        columns = self.graph.get_columns(class_name)
+        mask = attribute_filter.as_mask(columns)
+        nodes = columns.nodes
+        return [nodes[i] for i in np.flatnonzero(mask)]
     
     def filter_all_nodes(self, attribute_filter: FilterExpression) -> List[Node]:
         """
@@ -701,7 +1484,53 @@ class GraphFilter:
         Returns:
             List of all matching nodes
         """
-        return [node for node in self.graph.nodes.values() if attribute_filter.matches(node)]
+        if (np is None or len(self.graph.nodes) < self.VECTORIZE_THRESHOLD
+                or not hasattr(attribute_filter, "as_mask")):
+            return [node for node in self.graph.nodes.values() if attribute_filter.matches(node)]
+        
+        columns = self.graph.get_columns()
+        mask = attribute_filter.as_mask(columns)
+        nodes = columns.nodes
+        return [nodes[i] for i in np.flatnonzero(mask)]
+    
+    def filter_all_nodes_parallel(self, attribute_filter: FilterExpression,
+                                  n_jobs: Optional[int] = None) -> List[Node]:
+        """
+        Filter all nodes by evaluating shards of the node set on a thread pool
+        
+        This is the row-wise path for installs without numpy. When numpy is
+        available the vectorized filter_all_nodes is faster than any number of
+        threads and is used instead, as it is below PARALLEL_FILTER_THRESHOLD
+        nodes.
+        
+        Args:
+            attribute_filter: FilterExpression to apply
+            n_jobs: Number of worker threads; None for the CPU count, negative
+                values count back from it as in joblib (-1 = all CPUs)
+        
+        Returns:
+            List of all matching nodes, in graph order
+        """
+        cpus = os.cpu_count() or 1
+        if n_jobs is None:
+            n_jobs = cpus
+        elif n_jobs < 0:
+            n_jobs = max(cpus + 1 + n_jobs, 1)
+        elif n_jobs == 0:
+            raise ValueError("n_jobs must be a positive or negative integer, not 0")
+        
+        if np is not None or len(self.graph.nodes) < self.PARALLEL_FILTER_THRESHOLD:
+            return self.filter_all_nodes(attribute_filter)
+        
+        nodes = list(self.graph.nodes.values())
+        chunk_size = -(-len(nodes) // n_jobs)
+        chunks = [nodes[i:i + chunk_size] for i in range(0, len(nodes), chunk_size)]
+        
+        # Sort filters up front so worker threads never race on optimize()
+        attribute_filter.optimize()
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            results = executor.map(_chunk_match, chunks, [attribute_filter] * len(chunks))
+            return [node for chunk_result in results for node in chunk_result]
 
 
 class GraphQuery:
@@ -712,57 +1541,142 @@ class GraphQuery:
     
     def find_paths(self, start_node_id: str, end_node_id: str,
                   max_depth: int = 10) -> List[List[str]]:
-        """Find all paths between two nodes (BFS)"""
-        from collections import deque
-        
-        if start_node_id not in self.graph.nodes:
-            return []
-        
-        queue = deque([(start_node_id, [start_node_id])])
-        paths = []
-        visited_states = set()
+        """
+        Find all simple paths between two nodes
         
-        while queue:
-            current, path = queue.popleft()
-            
-            if len(path) > max_depth:
-                continue
-            
-            state = (current, tuple(path))
-            if state in visited_states:
+        Paths hold at most max_depth nodes and are returned shortest first.
+        """
+        # Depth-first discovery is lexicographic by edge order; a stable sort by
+        # length gives the same order as a breadth-first search
+        paths = list(self.iter_paths(start_node_id, end_node_id, max_depth))
+        paths.sort(key=len)
+        return paths
+    
+    def iter_paths(self, start_node_id: str, end_node_id: str,
+                   max_depth: int = 10) -> Iterator[List[str]]:
+        """Lazily yield the paths find_paths would return, in depth-first order"""
+        if start_node_id not in self.graph.nodes or max_depth < 1:
+            return
+        if start_node_id == end_node_id:
+            yield [start_node_id]
+            return
+        
+        path = [start_node_id]
+        in_path = {start_node_id}
+        # One successor iterator per node on the current path
+        stack = [iter(self._successors(start_node_id))] if max_depth > 1 else []
+        
+        while stack:
+            next_node = next(stack[-1], None)
+            if next_node is None:
+                stack.pop()
+                in_path.discard(path.pop())
                 continue
-            visited_states.add(state)
             
-            if current == end_node_id:
-                paths.append(path)
+            if next_node in in_path:  # Avoid cycles
                 continue
             
-            # Get all outgoing edges
-            for edge in self.graph.get_outgoing_edges(current):
-                next_node = edge.to_node_id
-                if next_node not in path:  # Avoid cycles
-                    queue.append((next_node, path + [next_node]))
+            if next_node == end_node_id:
+                yield path + [next_node]
+            elif len(path) + 1 < max_depth:
+                path.append(next_node)
+                in_path.add(next_node)
+                stack.append(iter(self._successors(next_node)))
+    
+    def find_shortest_path(self, start_node_id: str, end_node_id: str) -> List[str]:
+        """
+        Find one shortest path between two nodes (bidirectional BFS)
         
-        return paths
+        Searches forward along outgoing edges from the start and backward
+        along incoming edges from the end, always expanding the smaller
+        frontier, until the two searches meet.
+        
+        Returns:
+            List of node IDs from start to end, or an empty list if unreachable
+        """
+        if start_node_id not in self.graph.nodes or end_node_id not in self.graph.nodes:
+            return []
+        if start_node_id == end_node_id:
+            return [start_node_id]
+        
+        # node_id -> (parent node_id, distance from the search origin)
+        fwd = {start_node_id: (None, 0)}
+        bwd = {end_node_id: (None, 0)}
+        fwd_frontier = [start_node_id]
+        bwd_frontier = [end_node_id]
+        
+        while fwd_frontier and bwd_frontier:
+            if len(fwd_frontier) <= len(bwd_frontier):
+                fwd_frontier, meet = self._expand_frontier(fwd_frontier, fwd, bwd, forward=True)
+            else:
+                bwd_frontier, meet = self._expand_frontier(bwd_frontier, bwd, fwd, forward=False)
+            
+            if meet is not None:
+                path = []
+                current = meet
+                while current is not None:
+                    path.append(current)
+                    current = fwd[current][0]
+                path.reverse()
+                current = bwd[meet][0]
+                while current is not None:
+                    path.append(current)
+                    current = bwd[current][0]
+                return path
+        
+        return []
+    
+    def _expand_frontier(self, frontier: List[str], parents: Dict[str, Tuple[Optional[str], int]],
+                         other: Dict[str, Tuple[Optional[str], int]],
+                         forward: bool) -> Tuple[List[str], Optional[str]]:
+        """Expand one BFS level; return the new frontier and the best meeting node"""
+        next_frontier = []
+        meet = None
+        meet_distance = None
+        
+        for node_id in frontier:
+            distance = parents[node_id][1] + 1
+            if forward:
+                neighbors = [edge.to_node_id for edge in self.graph.get_outgoing_edges(node_id)]
+            else:
+                neighbors = [edge.from_node_id for edge in self.graph.get_incoming_edges(node_id)]
+            
+            for neighbor in neighbors:
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = (node_id, distance)
+                next_frontier.append(neighbor)
+                if neighbor in other:
+                    # The meeting node closest to the other origin gives the shortest path
+                    total = distance + other[neighbor][1]
+                    if meet_distance is None or total < meet_distance:
+                        meet, meet_distance = neighbor, total
+        
+        return next_frontier, meet
+    
+    def _successors(self, node_id: str) -> List[str]:
+        """Distinct targets of a node's outgoing edges, in edge order"""
+        return list(dict.fromkeys(edge.to_node_id for edge in self.graph.get_outgoing_edges(node_id)))
     
     def find_related_nodes(self, node_id: str, relationship_type: Optional[str] = None,
                           direction: str = "both") -> List[Tuple[Node, str]]:
         """Find nodes related to a given node"""
-        results = []
-        
+        return list(self.iter_related_nodes(node_id, relationship_type, direction))
+    
+    def iter_related_nodes(self, node_id: str, relationship_type: Optional[str] = None,
+                           direction: str = "both") -> Iterator[Tuple[Node, str]]:
+        """Lazily yield the (node, relationship) pairs find_related_nodes would return"""
         if direction in ("out", "both"):
             for edge in self.graph.get_outgoing_edges(node_id, relationship_type):
                 target = self.graph.get_node(edge.to_node_id)
                 if target:
-                    results.append((target, edge.edge_type))
+                    yield target, edge.edge_type
         
         if direction in ("in", "both"):
             for edge in self.graph.get_incoming_edges(node_id, relationship_type):
                 source = self.graph.get_node(edge.from_node_id)
                 if source:
-                    results.append((source, edge.edge_type))
-        
-        return results
+                    yield source, edge.edge_type
     
     def get_nodes_by_class_and_attribute(self, class_name: str,
                                         attr_name: str,
@@ -5,29 +5,56 @@
 
 import unittest
 import tempfile
-import shutil
 from pathlib import Path
 import sys
 import os
+import threading
+import time
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from graph_system import (
     NodeSchema, Node, Edge, SchemaRegistry, GraphStore, GraphQuery, EdgeType,
-    AttributeFilter, FilterExpression, GraphFilter
+    AttributeFilter, FilterExpression, GraphFilter, CSRAdjacency
 )
 
+# Test data only lives for one test class, so keep it on tmpfs where available
+TEMP_ROOT = "/dev/shm" if sys.platform.startswith("linux") and os.path.isdir("/dev/shm") else None
+
+
+class GraphTestCase(unittest.TestCase):
+    """Base class sharing one GraphStore per test class, emptied before each test"""
+    
+    SCHEMAS = {"Person": {"age": "int", "city": "string"}}
+    
+    @classmethod
+    def setUpClass(cls):
+        temp = tempfile.TemporaryDirectory(dir=TEMP_ROOT, prefix="graphtest_")
+        cls.addClassCleanup(temp.cleanup)
+        cls.temp_dir = Path(temp.name)
+        cls.graph = GraphStore(cls.temp_dir)
+        for class_name, attributes in cls.SCHEMAS.items():
+            cls.graph.schema_registry.register_class(class_name, parent_class="Thing", attributes=attributes)
+    
+    def setUp(self):
+        self.graph.reset()
+
 
 class TestSchemaRegistry(unittest.TestCase):
     """Test Schema Registration and Class Hierarchy"""
     
-    def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.registry = SchemaRegistry(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        temp = tempfile.TemporaryDirectory(dir=TEMP_ROOT, prefix="graphtest_")
+        cls.addClassCleanup(temp.cleanup)
+        cls.temp_dir = Path(temp.name)
+        cls.registry = SchemaRegistry(cls.temp_dir)
+        cls.initial_schemas = dict(cls.registry.schemas)
     
-    def tearDown(self):
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
+    def setUp(self):
+        self.registry.reset(self.initial_schemas)
     
     def test_thing_schema_exists(self):
         schema = self.registry.get_schema("Thing")
@@ -66,6 +93,17 @@ class TestSchemaRegistry(unittest.TestCase):
         hierarchy = self.registry.get_class_hierarchy("Dog")
         self.assertEqual(hierarchy, ["Dog", "Animal", "Thing"])
     
+    def test_hierarchy_cache_follows_new_classes(self):
+        self.registry.register_class("Animal", parent_class="Thing")
+        self.assertFalse(self.registry.is_subclass_of("Dog", "Animal"))
+        self.assertEqual(self.registry.get_class_hierarchy("Dog"), ["Dog"])
+        self.registry.register_class("Dog", parent_class="Animal")
+        self.assertTrue(self.registry.is_subclass_of("Dog", "Animal"))
+        self.registry.get_class_hierarchy("Dog").append("Mutated")
+        self.assertEqual(self.registry.get_class_hierarchy("Dog"), ["Dog", "Animal", "Thing"])
+        self.registry.reset()
+        self.assertEqual(self.registry.get_class_hierarchy("Dog"), ["Dog"])
+    
     def test_is_subclass_of(self):
         self.registry.register_class("Animal", parent_class="Thing")
         self.registry.register_class("Dog", parent_class="Animal")
@@ -89,18 +127,10 @@ class TestSchemaRegistry(unittest.TestCase):
         self.assertEqual(schema.class_name, "Person")
 
 
-class TestGraphStore(unittest.TestCase):
+class TestGraphStore(GraphTestCase):
     """Test Graph Store Operations"""
     
-    def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.graph = GraphStore(self.temp_dir)
-        self.graph.schema_registry.register_class("Person", parent_class="Thing", attributes={"age": "int"})
-        self.graph.schema_registry.register_class("Organization", parent_class="Thing", attributes={"industry": "string"})
-    
-    def tearDown(self):
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
+    SCHEMAS = {"Person": {"age": "int"}, "Organization": {"industry": "string"}}
     
     def test_create_node(self):
         node = self.graph.create_node("Person", "Alice", {"age": 30})
@@ -109,6 +139,17 @@ class TestGraphStore(unittest.TestCase):
         self.assertEqual(node.name, "Alice")
         self.assertEqual(node.attributes["age"], 30)
     
+    def test_ids_are_unique_across_stores(self):
+        graph2 = GraphStore(self.temp_dir)
+        alice = self.graph.create_node("Person", "Alice")
+        ids = {self.graph.create_node("Person", "P").node_id for _ in range(100)}
+        ids |= {graph2.create_node("Person", "P").node_id for _ in range(100)}
+        self.assertEqual(len(ids), 200)
+        self.assertNotIn(alice.node_id, ids)
+        edge1 = self.graph.create_edge(alice.node_id, alice.node_id, "knows")
+        edge2 = self.graph.create_edge(alice.node_id, alice.node_id, "knows")
+        self.assertNotEqual(edge1.edge_id, edge2.edge_id)
+    
     def test_create_node_invalid_class(self):
         with self.assertRaises(ValueError):
             self.graph.create_node("InvalidClass", "test")
@@ -147,6 +188,16 @@ class TestGraphStore(unittest.TestCase):
         self.graph.delete_node(alice.node_id)
         self.assertIsNone(self.graph.get_edge(edge.edge_id))
     
+    def test_delete_node_deletes_self_loop(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        loop = self.graph.create_edge(alice.node_id, alice.node_id, "knows")
+        other = self.graph.create_edge(bob.node_id, alice.node_id, "knows")
+        self.assertTrue(self.graph.delete_node(alice.node_id))
+        self.assertIsNone(self.graph.get_edge(loop.edge_id))
+        self.assertIsNone(self.graph.get_edge(other.edge_id))
+        self.assertEqual(self.graph.get_outgoing_edges(bob.node_id), [])
+    
     def test_create_edge(self):
         alice = self.graph.create_node("Person", "Alice")
         bob = self.graph.create_node("Person", "Bob")
@@ -209,6 +260,50 @@ class TestGraphStore(unittest.TestCase):
         incoming = self.graph.get_incoming_edges(alice.node_id)
         self.assertEqual(len(incoming), 2)
     
+    def test_typed_edge_lookup_after_delete(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        knows = self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        likes = self.graph.create_edge(alice.node_id, bob.node_id, "likes")
+        self.graph.delete_edge(knows.edge_id)
+        self.assertEqual(self.graph.get_outgoing_edges(alice.node_id, "knows"), [])
+        self.assertEqual(self.graph.get_incoming_edges(bob.node_id, "likes"), [likes])
+        self.graph.delete_node(alice.node_id)
+        self.assertEqual(self.graph.get_incoming_edges(bob.node_id, "likes"), [])
+    
+    def test_neighbor_arrays_follow_edge_changes(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        self.assertEqual(self.graph.get_out_neighbors_arrays(alice.node_id), ((), ()))
+        edge = self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.assertEqual(self.graph.get_out_neighbors_arrays(alice.node_id), ((bob.node_id,), ("knows",)))
+        self.assertEqual(self.graph.get_in_neighbors_arrays(bob.node_id), ((alice.node_id,), ("knows",)))
+        self.graph.delete_edge(edge.edge_id)
+        self.assertEqual(self.graph.get_in_neighbors_arrays(bob.node_id), ((), ()))
+    
+    def test_csr_edge_type_codes_are_stable(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        knows = self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.graph.create_edge(bob.node_id, alice.node_id, "likes")
+        codes = dict(self.graph.get_csr().type_codes)
+        self.graph.delete_edge(knows.edge_id)
+        self.graph.create_edge(alice.node_id, bob.node_id, "works_with")
+        csr = self.graph.get_csr()
+        self.assertEqual(csr.type_codes["likes"], codes["likes"])
+        self.assertNotIn(csr.type_codes["works_with"], codes.values())
+        self.assertEqual(sorted(csr.etypes), sorted([codes["likes"]] * 2 + [csr.type_codes["works_with"]] * 2))
+    
+    def test_csr_built_during_a_change_is_stale(self):
+        alice = self.graph.create_node("Person", "Alice")
+        def build_while_changing(*args):
+            self.graph.create_node("Person", "Bob")
+            return CSRAdjacency(*args)
+        
+        with patch("graph_system.CSRAdjacency", build_while_changing):
+            self.assertEqual(self.graph.get_csr().node_ids, [alice.node_id])
+        self.assertEqual(len(self.graph.get_csr().node_ids), 2)
+    
     def test_find_nodes_by_class(self):
         self.graph.create_node("Person", "Alice")
         self.graph.create_node("Person", "Bob")
@@ -216,6 +311,13 @@ class TestGraphStore(unittest.TestCase):
         persons = self.graph.find_nodes_by_class("Person")
         self.assertEqual(len(persons), 2)
     
+    def test_find_nodes_by_class_after_delete(self):
+        alice = self.graph.create_node("Person", "Alice")
+        self.graph.create_node("Person", "Bob")
+        self.graph.delete_node(alice.node_id)
+        self.assertEqual([n.name for n in self.graph.find_nodes_by_class("Person")], ["Bob"])
+        self.assertEqual(self.graph.find_nodes_by_class("Organization"), [])
+    
     def test_find_nodes_by_name(self):
         self.graph.create_node("Person", "Alice")
         self.graph.create_node("Person", "Alice")
@@ -223,6 +325,15 @@ class TestGraphStore(unittest.TestCase):
         nodes = self.graph.find_nodes_by_name("Alice")
         self.assertEqual(len(nodes), 3)
     
+    def test_find_nodes_by_name_follows_rename_and_delete(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        self.graph.update_node(alice.node_id, name="Alicia")
+        self.assertEqual(self.graph.find_nodes_by_name("Alice"), [])
+        self.assertEqual(self.graph.find_nodes_by_name("Alicia"), [alice])
+        self.graph.delete_node(bob.node_id)
+        self.assertEqual(self.graph.find_nodes_by_name("Bob"), [])
+    
     def test_graph_persistence(self):
         alice = self.graph.create_node("Person", "Alice")
         bob = self.graph.create_node("Person", "Bob")
@@ -231,93 +342,152 @@ class TestGraphStore(unittest.TestCase):
         retrieved_alice = graph2.get_node(alice.node_id)
         self.assertIsNotNone(retrieved_alice)
         self.assertEqual(retrieved_alice.name, "Alice")
+    
+    def test_persistence_round_trips_attribute_values(self):
+        attributes = {"big": 2 ** 70, "ratio": 0.5, "city": "Zürich", "tags": ["a", None], "flag": True}
+        alice = self.graph.create_node("Person", "Alice", attributes)
+        graph2 = GraphStore(self.temp_dir)
+        self.assertEqual(graph2.get_node(alice.node_id).attributes, attributes)
+        # One node per value, so no other long number in the file forces the slow path
+        for value in (2 ** 70, -2 ** 70, 9300000000000000001, -9300000000000000001, 2 ** 63 - 1, -2 ** 63):
+            with self.subTest(value=value):
+                node = self.graph.create_node("Person", "Bob", {"n": value})
+                loaded = GraphStore(self.temp_dir).get_node(node.node_id).attributes["n"]
+                self.assertEqual((type(loaded), loaded), (int, value))
+    
+    def test_persistence_round_trips_non_finite_floats(self):
+        alice = self.graph.create_node("Person", "Alice", {"nan": float("nan"), "scores": [float("inf"), -float("inf")]})
+        attributes = GraphStore(self.temp_dir).get_node(alice.node_id).attributes
+        self.assertNotEqual(attributes["nan"], attributes["nan"])
+        self.assertEqual(attributes["scores"], [float("inf"), -float("inf")])
+    
+    @unittest.skipIf(os.name != "posix", "POSIX file modes")
+    def test_saved_files_follow_umask(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        alice = self.graph.create_node("Person", "Alice")
+        mode = (self.graph.nodes_dir / f"{alice.node_id}.json").stat().st_mode & 0o777
+        self.assertEqual(mode, 0o666 & ~umask)
+    
+    def test_loaded_nodes_and_edges_share_interned_names(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.graph.create_edge(bob.node_id, alice.node_id, "knows")
+        graph2 = GraphStore(self.temp_dir)
+        self.assertIs(graph2.get_node(alice.node_id).class_name, graph2.get_node(bob.node_id).class_name)
+        edge_types = {id(e.edge_type) for e in graph2.edges.values()}
+        self.assertEqual(len(edge_types), 1)
+    
+    def test_batch_defers_writes(self):
+        with self.graph.batch():
+            alice = self.graph.create_node("Person", "Alice")
+            bob = self.graph.create_node("Person", "Bob")
+            edge = self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+            self.assertFalse(self.graph._get_node_path(alice.node_id).exists())
+        self.assertTrue(self.graph._get_node_path(alice.node_id).exists())
+        self.assertTrue(self.graph._get_edge_path(edge.edge_id).exists())
+        graph2 = GraphStore(self.temp_dir)
+        self.assertEqual(len(graph2.find_nodes_by_class("Person")), 2)
+    
+    def test_flush_inside_batch(self):
+        with self.graph.batch():
+            alice = self.graph.create_node("Person", "Alice")
+            self.graph.flush()
+            self.assertTrue(self.graph._get_node_path(alice.node_id).exists())
+            bob = self.graph.create_node("Person", "Bob")
+            self.assertFalse(self.graph._get_node_path(bob.node_id).exists())
+        self.assertTrue(self.graph._get_node_path(bob.node_id).exists())
+        self.assertEqual([p.suffix for p in self.graph.nodes_dir.iterdir()], [".json", ".json"])
+    
+    def test_batch_drops_writes_of_deleted_nodes(self):
+        with self.graph.batch():
+            alice = self.graph.create_node("Person", "Alice")
+            self.graph.delete_node(alice.node_id)
+        self.assertFalse(self.graph._get_node_path(alice.node_id).exists())
+    
+    def test_batch_is_per_thread(self):
+        entered, release = threading.Event(), threading.Event()
+        created = {}
+        
+        def batch_in_thread():
+            with self.graph.batch():
+                created["alice"] = self.graph.create_node("Person", "Alice")
+                entered.set()
+                release.wait(5)
+        
+        worker = threading.Thread(target=batch_in_thread)
+        worker.start()
+        try:
+            self.assertTrue(entered.wait(5))
+            bob = self.graph.create_node("Person", "Bob")
+            self.assertTrue(self.graph._get_node_path(bob.node_id).exists())
+            with self.graph.batch():
+                charlie = self.graph.create_node("Person", "Charlie")
+            self.assertTrue(self.graph._get_node_path(charlie.node_id).exists())
+            self.assertFalse(self.graph._get_node_path(created["alice"].node_id).exists())
+        finally:
+            release.set()
+            worker.join()
+        self.assertTrue(self.graph._get_node_path(created["alice"].node_id).exists())
+    
+    def test_reset_clears_graph_but_keeps_schemas(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.graph.reset()
+        self.assertEqual(self.graph.find_nodes_by_class("Person"), [])
+        self.assertEqual(self.graph.get_incoming_edges(bob.node_id), [])
+        graph2 = GraphStore(self.temp_dir)
+        self.assertEqual(len(graph2.nodes), 0)
+        self.assertIsNotNone(graph2.schema_registry.get_schema("Person"))
 
 
-class TestAttributeFilter(unittest.TestCase):
+class TestAttributeFilter(GraphTestCase):
     """Test Attribute Filtering"""
     
-    def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.graph = GraphStore(self.temp_dir)
-        self.graph.schema_registry.register_class("Person", parent_class="Thing", attributes={"age": "int", "city": "string"})
-    
-    def tearDown(self):
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
-    
-    def test_filter_equality(self):
-        node = self.graph.create_node("Person", "Alice", {"age": 30})
-        filter_eq = AttributeFilter("age", "==", 30)
-        self.assertTrue(filter_eq.matches(node))
-        filter_ne = AttributeFilter("age", "==", 25)
-        self.assertFalse(filter_ne.matches(node))
-    
-    def test_filter_not_equal(self):
-        node = self.graph.create_node("Person", "Alice", {"age": 30})
-        filter_ne = AttributeFilter("age", "!=", 25)
-        self.assertTrue(filter_ne.matches(node))
-        filter_eq = AttributeFilter("age", "!=", 30)
-        self.assertFalse(filter_eq.matches(node))
-    
-    def test_filter_less_equal(self):
-        node = self.graph.create_node("Person", "Alice", {"age": 30})
-        filter_le = AttributeFilter("age", "<=", 30)
-        self.assertTrue(filter_le.matches(node))
-        filter_le2 = AttributeFilter("age", "<=", 25)
-        self.assertFalse(filter_le2.matches(node))
-    
-    def test_filter_greater_equal(self):
-        node = self.graph.create_node("Person", "Alice", {"age": 30})
-        filter_ge = AttributeFilter("age", ">=", 30)
-        self.assertTrue(filter_ge.matches(node))
-        filter_ge2 = AttributeFilter("age", ">=", 35)
-        self.assertFalse(filter_ge2.matches(node))
-    
-    def test_filter_less_than(self):
-        node = self.graph.create_node("Person", "Alice", {"age": 30})
-        filter_lt = AttributeFilter("age", "<", 35)
-        self.assertTrue(filter_lt.matches(node))
-        filter_lt2 = AttributeFilter("age", "<", 30)
-        self.assertFalse(filter_lt2.matches(node))
-    
-    def test_filter_greater_than(self):
-        node = self.graph.create_node("Person", "Alice", {"age": 30})
-        filter_gt = AttributeFilter("age", ">", 25)
-        self.assertTrue(filter_gt.matches(node))
-        filter_gt2 = AttributeFilter("age", ">", 30)
-        self.assertFalse(filter_gt2.matches(node))
-    
-    def test_filter_in(self):
-        node = self.graph.create_node("Person", "Alice", {"age": 30})
-        filter_in = AttributeFilter("age", "in", [25, 30, 35])
-        self.assertTrue(filter_in.matches(node))
-        filter_in2 = AttributeFilter("age", "in", [20, 25, 35])
-        self.assertFalse(filter_in2.matches(node))
-    
-    def test_filter_contains(self):
-        node = self.graph.create_node("Person", "Alice", {"city": "New York"})
+    def test_filter_all_operators(self):
+        node = self.graph.create_node("Person", "Alice", {"age": 30, "city": "New York"})
+        cases = [
+            ("age", "==", 30, True), ("age", "==", 25, False),
+            ("age", "!=", 25, True), ("age", "!=", 30, False),
+            ("age", "<=", 30, True), ("age", "<=", 25, False),
+            ("age", ">=", 30, True), ("age", ">=", 35, False),
+            ("age", "<", 35, True), ("age", "<", 30, False),
+            ("age", ">", 25, True), ("age", ">", 30, False),
+            ("age", "in", [25, 30, 35], True), ("age", "in", [20, 25, 35], False),
+            ("city", "contains", "York", True), ("city", "contains", "London", False),
+        ]
+        for attribute, op, value, expected in cases:
+            with self.subTest(op=op, value=value):
+                self.assertEqual(AttributeFilter(attribute, op, value).matches(node), expected)
+    
+    def test_filter_contains_memoizes_by_value(self):
+        alice = self.graph.create_node("Person", "Alice", {"city": "New York"})
+        bob = self.graph.create_node("Person", "Bob", {"city": "New York"})
         filter_contains = AttributeFilter("city", "contains", "York")
-        self.assertTrue(filter_contains.matches(node))
-        filter_contains2 = AttributeFilter("city", "contains", "London")
-        self.assertFalse(filter_contains2.matches(node))
+        self.assertTrue(filter_contains.matches(alice))
+        self.assertTrue(filter_contains.matches(bob))
+        self.assertEqual(filter_contains._memo, {"New York": True})
+        self.graph.update_node(bob.node_id, attributes={"city": "LA"})
+        self.assertFalse(filter_contains.matches(bob))
     
     def test_invalid_operator_raises_error(self):
         with self.assertRaises(ValueError):
             AttributeFilter("age", "invalid_op", 30)
+    
+    def test_filter_none_value_is_distinct_from_missing(self):
+        with_none = self.graph.create_node("Person", "Alice", {"city": None})
+        without = self.graph.create_node("Person", "Bob")
+        self.assertTrue(AttributeFilter("city", "==", None).matches(with_none))
+        self.assertTrue(AttributeFilter("city", "!=", "NYC").matches(with_none))
+        self.assertFalse(AttributeFilter("city", "==", None).matches(without))
+        self.assertFalse(AttributeFilter("city", "!=", "NYC").matches(without))
 
 
-class TestFilterExpression(unittest.TestCase):
+class TestFilterExpression(GraphTestCase):
     """Test Filter Expressions with AND/OR logic"""
     
-    def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.graph = GraphStore(self.temp_dir)
-        self.graph.schema_registry.register_class("Person", parent_class="Thing", attributes={"age": "int", "city": "string"})
-    
-    def tearDown(self):
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
-    
     def test_and_expression(self):
         node = self.graph.create_node("Person", "Alice", {"age": 30, "city": "NYC"})
         expr = FilterExpression([AttributeFilter("age", ">=", 25), AttributeFilter("city", "==", "NYC")], operator="AND")
@@ -339,24 +509,109 @@ class TestFilterExpression(unittest.TestCase):
         expr.add_filter(AttributeFilter("city", "==", "NYC"))
         self.assertTrue(expr.matches(node))
     
+    def test_optimize_orders_cheap_filters_first(self):
+        node = self.graph.create_node("Person", "Alice", {"age": 30, "city": "NYC"})
+        contains = AttributeFilter("city", "contains", "NY")
+        equals = AttributeFilter("age", "==", 30)
+        filters = [contains, equals]
+        expr = FilterExpression(filters, operator="AND")
+        self.assertTrue(expr.matches(node))
+        self.assertEqual(expr.filters, (equals, contains))
+        self.assertEqual(filters, [contains, equals])
+    
+    def test_or_of_many_contains_filters(self):
+        words = ["graph", "node", "edge", "path"]
+        expr = FilterExpression([AttributeFilter("bio", "contains", w) for w in words], operator="OR")
+        expr.add_filter(AttributeFilter("age", "==", 99))
+        hit = self.graph.create_node("Person", "Alice", {"bio": "likes edges", "age": 30})
+        miss = self.graph.create_node("Person", "Bob", {"bio": "likes trees", "age": 30})
+        other = self.graph.create_node("Person", "Carol", {"bio": 42, "age": 99})
+        self.assertTrue(expr.matches(hit))
+        self.assertFalse(expr.matches(miss))
+        self.assertTrue(expr.matches(other))
+        self.assertEqual(len(expr.filters), 5)
+    
+    def test_compiled_expression_matches_loop(self):
+        alice = self.graph.create_node("Person", "Alice", {"age": 30, "city": "NYC", "odd') or ('": 1})
+        bob = self.graph.create_node("Person", "Bob", {"city": "LA"})
+        cases = [
+            ([AttributeFilter("age", ">=", 30), AttributeFilter("city", "==", "NYC")], "AND"),
+            ([AttributeFilter("age", "<", 30), AttributeFilter("city", "in", ["LA"])], "OR"),
+            ([AttributeFilter("age", "!=", 1), AttributeFilter("odd') or ('", "==", 1)], "AND"),
+            ([AttributeFilter("city", "contains", "Y"), AttributeFilter("city", "contains", "A"),
+              AttributeFilter("age", ">", 40)], "OR"),
+        ]
+        for filters, op in cases:
+            expr = FilterExpression(filters, operator=op).optimize()
+            for node in (alice, bob):
+                with self.subTest(op=op, node=node.name):
+                    self.assertEqual(expr._match.__name__, "_compiled")
+                    self.assertEqual(expr.matches(node), expr._match_and(node) if op == "AND" else expr._match_or(node))
+    
+    def test_compiled_expression_follows_filter_changes(self):
+        alice = self.graph.create_node("Person", "Alice", {"age": 30, "city": "LA"})
+        cities = ["NYC"]
+        city = AttributeFilter("city", "in", cities)
+        expr = FilterExpression([AttributeFilter("age", ">=", 18), AttributeFilter("age", "<", 65)])
+        self.assertTrue(expr.matches(alice))
+        cities.append("LA")
+        expr.add_filter(city)
+        self.assertFalse(expr.matches(alice))
+        self.assertEqual(expr.cache_key(), FilterExpression(list(expr.filters)).cache_key())
+        with self.assertRaises(AttributeError):
+            expr.filters.append(AttributeFilter("age", "==", 1))
+        with self.assertRaises(AttributeError):
+            expr.operator = "OR"
+        with self.assertRaises(AttributeError):
+            city.value = ["LA"]
+    
+    def test_nested_expression(self):
+        alice = self.graph.create_node("Person", "Alice", {"age": 30, "city": "NYC"})
+        bob = self.graph.create_node("Person", "Bob", {"age": 25, "city": "LA"})
+        city = FilterExpression([AttributeFilter("city", "==", "NYC"), AttributeFilter("city", "==", "SF")], operator="OR")
+        expr = FilterExpression([AttributeFilter("age", ">=", 18), city], operator="AND")
+        self.assertTrue(expr.matches(alice))
+        self.assertFalse(expr.matches(bob))
+        expr.optimize()
+        self.assertFalse(expr.matches(bob))
+        same = FilterExpression([AttributeFilter("age", ">=", 18), FilterExpression(
+            [AttributeFilter("city", "==", "NYC"), AttributeFilter("city", "==", "SF")], operator="OR")])
+        self.assertEqual(expr.cache_key(), same.cache_key())
+        self.assertNotEqual(expr.cache_key(), FilterExpression([AttributeFilter("age", ">=", 18)]).cache_key())
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        traversed = GraphFilter(self.graph).traverse_with_filter(alice.node_id, attribute_filter=expr)
+        self.assertEqual([n.name for n in traversed], ["Alice"])
+    
+    def test_expression_short_circuits(self):
+        calls = []
+        
+        class RecordingFilter(AttributeFilter):
+            def matches(self, node):
+                calls.append(self.attribute)
+                return super().matches(node)
+        
+        node = self.graph.create_node("Person", "Alice", {"age": 30, "city": "NYC"})
+        expr = FilterExpression([RecordingFilter("age", "==", 31), RecordingFilter("city", "==", "NYC")], operator="AND")
+        self.assertFalse(expr.matches(node))
+        self.assertEqual(calls, ["age"])
+        calls.clear()
+        expr = FilterExpression([RecordingFilter("age", "==", 30), RecordingFilter("city", "==", "LA")], operator="OR")
+        self.assertTrue(expr.matches(node))
+        self.assertEqual(calls, ["age"])
+    
     def test_empty_expression_matches_all(self):
         node = self.graph.create_node("Person", "Alice", {"age": 30})
         expr = FilterExpression()
         self.assertTrue(expr.matches(node))
 
 
-class TestGraphFilter(unittest.TestCase):
+class TestGraphFilter(GraphTestCase):
     """Test Graph Filtering Engine"""
     
     def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.graph = GraphStore(self.temp_dir)
+        super().setUp()
         self.graph_filter = GraphFilter(self.graph)
-        self.graph.schema_registry.register_class("Person", parent_class="Thing", attributes={"age": "int", "city": "string"})
-    
-    def tearDown(self):
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
+        self.graph_filter.VECTORIZE_THRESHOLD = 0  # exercise the numpy path on small fixtures
     
     def test_connected_nodes_excluding_is_a(self):
         alice = self.graph.create_node("Person", "Alice", {"age": 30})
@@ -379,6 +634,17 @@ class TestGraphFilter(unittest.TestCase):
         self.assertEqual(len(connected), 1)
         self.assertEqual(connected[0].name, "Charlie")
     
+    def test_connected_nodes_without_filter_dedups_in_edge_order(self):
+        alice = self.graph.create_node("Person", "Alice")
+        bob = self.graph.create_node("Person", "Bob")
+        charlie = self.graph.create_node("Person", "Charlie")
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.graph.create_edge(alice.node_id, bob.node_id, "likes")
+        self.graph.create_edge(charlie.node_id, alice.node_id, "knows")
+        self.graph.create_edge(bob.node_id, alice.node_id, "knows")
+        connected = self.graph_filter.get_connected_nodes(alice.node_id)
+        self.assertEqual([n.name for n in connected], ["Bob", "Charlie"])
+    
     def test_traverse_with_filter(self):
         alice = self.graph.create_node("Person", "Alice", {"age": 30})
         bob = self.graph.create_node("Person", "Bob", {"age": 25})
@@ -401,6 +667,22 @@ class TestGraphFilter(unittest.TestCase):
         nodes = self.graph_filter.filter_nodes_by_class("Person", filter_expr)
         self.assertEqual(len(nodes), 2)
     
+    def test_filter_nodes_by_class_vectorized_matches_row_wise(self):
+        self.graph.schema_registry.register_class("Robot", parent_class="Thing")
+        self.graph.create_node("Person", "Alice", {"age": 30, "city": "NYC"})
+        self.graph.create_node("Robot", "R2", {"age": 40, "city": "NYC"})
+        bob = self.graph.create_node("Person", "Bob", {"city": "SF"})
+        charlie = self.graph.create_node("Person", "Charlie", {"age": 35, "city": "LA"})
+        filter_expr = FilterExpression([AttributeFilter("age", ">", 31), AttributeFilter("city", "==", "NYC")], operator="OR")
+        vectorized = self.graph_filter.filter_nodes_by_class("Person", filter_expr)
+        with patch("graph_system.np", None):
+            row_wise = self.graph_filter.filter_nodes_by_class("Person", filter_expr)
+        self.assertEqual([n.name for n in vectorized], ["Alice", "Charlie"])
+        self.assertEqual(vectorized, row_wise)
+        self.graph.update_node(bob.node_id, attributes={"age": 50})
+        self.graph.delete_node(charlie.node_id)
+        self.assertEqual([n.name for n in self.graph_filter.filter_nodes_by_class("Person", filter_expr)], ["Alice", "Bob"])
+    
     def test_filter_all_nodes(self):
         self.graph.create_node("Person", "Alice", {"age": 30})
         self.graph.create_node("Person", "Bob", {"age": 25})
@@ -409,6 +691,88 @@ class TestGraphFilter(unittest.TestCase):
         nodes = self.graph_filter.filter_all_nodes(filter_expr)
         self.assertEqual(len(nodes), 2)
     
+    def test_filter_all_nodes_vectorized_matches_row_wise_on_edge_values(self):
+        big = 2 ** 53
+        self.graph.create_node("Person", "A", {"n": big + 1, "i": big + 1, "k": 3, "s": "ab\x00"})
+        self.graph.create_node("Person", "B", {"n": 0.5, "i": 3, "k": 7, "s": "ab"})
+        self.graph.create_node("Person", "C", {"n": big, "i": big, "k": big, "s": "b"})
+        cases = [
+            ("n", "==", big), ("n", "==", float(big)), ("n", ">", big), ("n", "in", [big]),
+            ("i", "==", float(big)), ("i", ">=", big + 1), ("i", "in", [float(big)]),
+            ("k", "<", 2 ** 63), ("k", "==", big + 1), ("k", "==", 3.0), ("k", "in", [7, big + 1]),
+            ("s", "==", "ab"), ("s", "==", "ab\x00"), ("s", "<", "ab\x00"), ("s", "in", ["ab"]),
+            ("s", "contains", "\x00"), ("s", "contains", "b"),
+        ]
+        for attribute, op, value in cases:
+            with self.subTest(attribute=attribute, op=op, value=value):
+                filter_expr = FilterExpression([AttributeFilter(attribute, op, value)])
+                row_wise = [n.name for n in self.graph.nodes.values() if filter_expr.matches(n)]
+                self.assertEqual([n.name for n in self.graph_filter.filter_all_nodes(filter_expr)], row_wise)
+    
+    def test_filter_accepts_filters_without_as_mask(self):
+        class OddAge:
+            def matches(self, node):
+                return node.attributes.get("age", 0) % 2 == 1
+        
+        self.graph.create_node("Person", "Alice", {"age": 31})
+        self.graph.create_node("Person", "Bob", {"age": 30})
+        self.assertEqual([n.name for n in self.graph_filter.filter_all_nodes(OddAge())], ["Alice"])
+        self.assertEqual([n.name for n in self.graph_filter.filter_nodes_by_class("Person", OddAge())], ["Alice"])
+        nested = FilterExpression([AttributeFilter("age", ">", 20), OddAge()])
+        self.assertEqual([n.name for n in self.graph_filter.filter_all_nodes(nested)], ["Alice"])
+    
+    def test_filter_all_nodes_parallel(self):
+        for i in range(40):
+            self.graph.create_node("Person", f"P{i}", {"age": i})
+        filter_expr = FilterExpression([AttributeFilter("age", ">=", 30)])
+        self.graph_filter.PARALLEL_FILTER_THRESHOLD = 0
+        with patch("graph_system.np", None):
+            nodes = self.graph_filter.filter_all_nodes_parallel(filter_expr, n_jobs=3)
+        self.assertEqual([n.name for n in nodes], [f"P{i}" for i in range(30, 40)])
+    
+    def test_filter_all_nodes_parallel_n_jobs(self):
+        for i in range(40):
+            self.graph.create_node("Person", f"P{i}", {"age": i})
+        filter_expr = FilterExpression([AttributeFilter("age", ">=", 30)])
+        self.graph_filter.PARALLEL_FILTER_THRESHOLD = 0
+        with patch("graph_system.np", None):
+            for n_jobs in (-1, -2, -1000, 1, 64):
+                with self.subTest(n_jobs=n_jobs):
+                    nodes = self.graph_filter.filter_all_nodes_parallel(filter_expr, n_jobs=n_jobs)
+                    self.assertEqual(len(nodes), 10)
+            with self.assertRaises(ValueError):
+                self.graph_filter.filter_all_nodes_parallel(filter_expr, n_jobs=0)
+    
+    def test_filter_all_nodes_mixed_attribute_types(self):
+        self.graph.create_node("Person", "Alice", {"age": 30, "city": "New York"})
+        self.graph.create_node("Person", "Bob", {"age": "unknown", "city": "York"})
+        self.graph.create_node("Person", "Charlie", {"age": 35.5})
+        self.graph.create_node("Person", "Dana", {"city": "LA"})
+        contains = FilterExpression([AttributeFilter("city", "contains", "York")])
+        self.assertEqual({n.name for n in self.graph_filter.filter_all_nodes(contains)}, {"Alice", "Bob"})
+        equals = FilterExpression([AttributeFilter("age", "==", "unknown")])
+        self.assertEqual([n.name for n in self.graph_filter.filter_all_nodes(equals)], ["Bob"])
+        in_list = FilterExpression([AttributeFilter("city", "in", ["LA", "York"]),
+                                    AttributeFilter("age", "in", [30])], operator="OR")
+        self.assertEqual({n.name for n in self.graph_filter.filter_all_nodes(in_list)}, {"Alice", "Bob", "Dana"})
+    
+    def test_filter_small_graph_skips_columns(self):
+        self.graph.create_node("Person", "Alice", {"age": 30})
+        self.graph.create_node("Person", "Bob", {"age": 25})
+        filter_expr = FilterExpression([AttributeFilter("age", ">", 25)])
+        graph_filter = GraphFilter(self.graph)
+        with patch.object(self.graph, "get_columns") as get_columns:
+            self.assertEqual([n.name for n in graph_filter.filter_all_nodes(filter_expr)], ["Alice"])
+            self.assertEqual([n.name for n in graph_filter.filter_nodes_by_class("Person", filter_expr)], ["Alice"])
+        get_columns.assert_not_called()
+    
+    def test_filter_all_nodes_sees_updates(self):
+        alice = self.graph.create_node("Person", "Alice", {"age": 30})
+        filter_expr = FilterExpression([AttributeFilter("age", ">", 25)])
+        self.assertEqual(len(self.graph_filter.filter_all_nodes(filter_expr)), 1)
+        self.graph.update_node(alice.node_id, attributes={"age": 20})
+        self.assertEqual(len(self.graph_filter.filter_all_nodes(filter_expr)), 0)
+    
     def test_connected_nodes_with_complex_filter(self):
         alice = self.graph.create_node("Person", "Alice", {"age": 30, "city": "NYC"})
         bob = self.graph.create_node("Person", "Bob", {"age": 25, "city": "NYC"})
@@ -420,6 +784,111 @@ class TestGraphFilter(unittest.TestCase):
         self.assertEqual(len(connected), 1)
         self.assertEqual(connected[0].name, "Charlie")
     
+    def test_iter_traverse_with_filter_is_lazy(self):
+        alice = self.graph.create_node("Person", "Alice", {"age": 30})
+        bob = self.graph.create_node("Person", "Bob", {"age": 25})
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        iterator = self.graph_filter.iter_traverse_with_filter(alice.node_id)
+        self.assertEqual(next(iterator).name, "Alice")
+        self.assertEqual([n.name for n in iterator], ["Bob"])
+        self.assertEqual([n.name for n in self.graph_filter.iter_connected_nodes(alice.node_id)], ["Bob"])
+    
+    def test_iter_traverse_skips_nodes_deleted_while_iterating(self):
+        people = [self.graph.create_node("Person", f"P{i}") for i in range(4)]
+        for a, b in zip(people, people[1:]):
+            self.graph.create_edge(a.node_id, b.node_id, "knows")
+        names = []
+        for node in self.graph_filter.iter_traverse_with_filter(people[0].node_id):
+            names.append(node.name)
+            if node.name == "P1":
+                self.graph.delete_node(people[3].node_id)
+        self.assertEqual(names, ["P0", "P1", "P2"])
+    
+    def test_traverse_cache_invalidated_on_mutation(self):
+        alice = self.graph.create_node("Person", "Alice", {"age": 30})
+        bob = self.graph.create_node("Person", "Bob", {"age": 35})
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        filter_expr = FilterExpression([AttributeFilter("age", ">=", 30)])
+        first = self.graph_filter.traverse_with_filter(alice.node_id, attribute_filter=filter_expr)
+        again = self.graph_filter.traverse_with_filter(
+            alice.node_id, attribute_filter=FilterExpression([AttributeFilter("age", ">=", 30)]))
+        self.assertEqual([n.node_id for n in first], [n.node_id for n in again])
+        self.assertEqual(len(first), 2)
+        self.graph.update_node(bob.node_id, attributes={"age": 20})
+        traversed = self.graph_filter.traverse_with_filter(alice.node_id, attribute_filter=filter_expr)
+        self.assertEqual([n.name for n in traversed], ["Alice"])
+    
+    def test_traverse_accepts_filters_without_cache_key(self):
+        alice = self.graph.create_node("Person", "Alice", {"age": 30})
+        bob = self.graph.create_node("Person", "Bob", {"age": 25})
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        traversed = self.graph_filter.traverse_with_filter(alice.node_id, attribute_filter=AttributeFilter("age", "<", 30))
+        self.assertEqual([n.name for n in traversed], ["Bob"])
+    
+    def test_traverse_cache_shared_across_threads(self):
+        people = [self.graph.create_node("Person", f"P{i}", {"age": i % 2}) for i in range(20)]
+        for a, b in zip(people, people[1:]):
+            self.graph.create_edge(a.node_id, b.node_id, "knows")
+        start = people[0].node_id
+        iter_traverse = self.graph_filter.iter_traverse_with_filter
+        
+        def slow_iter_traverse(*args, **kwargs):
+            # Yield the GIL between nodes so updates land mid-traversal
+            for node in iter_traverse(*args, **kwargs):
+                time.sleep(0.0001)
+                yield node
+        
+        def traverse(i):
+            if i % 20 == 0:
+                # Changes which nodes match while other threads traverse
+                self.graph.update_node(people[i % 20].node_id, attributes={"age": i // 20 % 2})
+            filter_expr = FilterExpression([AttributeFilter("age", ">=", 1)])
+            version = self.graph._version
+            cached = self.graph_filter.traverse_with_filter(start, attribute_filter=filter_expr)
+            uncached = list(self.graph_filter.iter_traverse_with_filter(start, attribute_filter=filter_expr))
+            if self.graph._version != version:
+                return None  # graph changed mid-call; nothing to compare against
+            return [n.node_id for n in cached] == [n.node_id for n in uncached]
+        
+        with patch.object(self.graph_filter, "iter_traverse_with_filter", slow_iter_traverse), \
+                ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(traverse, range(400)))
+        compared = [r for r in results if r is not None]
+        self.assertTrue(compared)
+        self.assertTrue(all(compared))
+    
+    def test_traverse_cache_skips_results_of_older_versions(self):
+        people = [self.graph.create_node("Person", f"P{i}", {"age": 1}) for i in range(3)]
+        for a, b in zip(people, people[1:]):
+            self.graph.create_edge(a.node_id, b.node_id, "knows")
+        filter_expr = FilterExpression([AttributeFilter("age", ">=", 1)])
+        iter_traverse = self.graph_filter.iter_traverse_with_filter
+        paused, resume = threading.Event(), threading.Event()
+        
+        def pausing_iter_traverse(*args, **kwargs):
+            pause = not paused.is_set()
+            for node in iter_traverse(*args, **kwargs):
+                yield node
+                if pause:
+                    pause = False
+                    paused.set()
+                    resume.wait(5)
+        
+        def traverse():
+            return self.graph_filter.traverse_with_filter(people[0].node_id, attribute_filter=filter_expr)
+        
+        with patch.object(self.graph_filter, "iter_traverse_with_filter", pausing_iter_traverse):
+            # A slow traversal sees P0 before the update and finishes after a fresh one
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                slow = pool.submit(traverse)
+                paused.wait(5)
+                self.graph.update_node(people[0].node_id, attributes={"age": 0})
+                fresh = traverse()
+                resume.set()
+                self.assertEqual([n.name for n in slow.result()], ["P0", "P1", "P2"])
+        self.assertEqual([n.name for n in fresh], ["P1", "P2"])
+        self.assertEqual([n.name for n in traverse()], ["P1", "P2"])
+    
     def test_traverse_with_depth_limit(self):
         n1 = self.graph.create_node("Person", "N1", {"age": 20})
         n2 = self.graph.create_node("Person", "N2", {"age": 20})
@@ -433,21 +902,32 @@ class TestGraphFilter(unittest.TestCase):
         names = {n.name for n in traversed}
         self.assertIn("N1", names)
         self.assertIn("N2", names)
+    
+    def test_traverse_backends_agree(self):
+        nodes = [self.graph.create_node("Person", f"N{i}", {"age": i}) for i in range(8)]
+        ids = [n.node_id for n in nodes]
+        for a, b, edge_type in [(0, 1, "knows"), (1, 2, "knows"), (2, 0, "knows"), (3, 2, "knows"),
+                                (2, 4, "is_a"), (4, 5, "knows"), (6, 5, "knows"), (5, 5, "knows")]:
+            self.graph.create_edge(ids[a], ids[b], edge_type)
+        for exclude in ([], ["is_a"]):
+            for depth in (-1, 0, 1, 2, 3):
+                traversed = list(self.graph_filter.iter_traverse_with_filter(ids[0], exclude, None, depth))
+                with patch("graph_system._bfs_csr_jit", None):
+                    pure = list(self.graph_filter.iter_traverse_with_filter(ids[0], exclude, None, depth))
+                self.assertEqual(traversed, pure, (exclude, depth))
+        reachable = self.graph_filter.traverse_with_filter(ids[0], exclude_edge_types=["is_a"])
+        self.assertEqual({n.name for n in reachable}, {"N0", "N1", "N2", "N3"})
 
 
-class TestGraphQuery(unittest.TestCase):
+class TestGraphQuery(GraphTestCase):
     """Test Graph Query Engine"""
     
+    SCHEMAS = {"Person": {"age": "int"}}
+    
     def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.graph = GraphStore(self.temp_dir)
-        self.graph.schema_registry.register_class("Person", parent_class="Thing", attributes={"age": "int"})
+        super().setUp()
         self.query = GraphQuery(self.graph)
     
-    def tearDown(self):
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
-    
     def test_find_direct_path(self):
         alice = self.graph.create_node("Person", "Alice")
         bob = self.graph.create_node("Person", "Bob")
@@ -466,38 +946,73 @@ class TestGraphQuery(unittest.TestCase):
         paths = self.query.find_paths(alice.node_id, bob.node_id)
         self.assertGreaterEqual(len(paths), 1)
     
-    def test_find_no_path(self):
+    def test_find_paths_with_cycles_and_parallel_edges(self):
         alice = self.graph.create_node("Person", "Alice")
         bob = self.graph.create_node("Person", "Bob")
-        paths = self.query.find_paths(alice.node_id, bob.node_id)
-        self.assertEqual(len(paths), 0)
+        charlie = self.graph.create_node("Person", "Charlie")
+        self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.graph.create_edge(alice.node_id, bob.node_id, "works_with")
+        self.graph.create_edge(bob.node_id, alice.node_id, "knows")
+        self.graph.create_edge(bob.node_id, charlie.node_id, "knows")
+        self.graph.create_edge(alice.node_id, charlie.node_id, "knows")
+        paths = self.query.find_paths(alice.node_id, charlie.node_id)
+        self.assertEqual(paths, [[alice.node_id, charlie.node_id],
+                                 [alice.node_id, bob.node_id, charlie.node_id]])
+        self.assertEqual(self.query.find_paths(alice.node_id, charlie.node_id, max_depth=2),
+                         [[alice.node_id, charlie.node_id]])
     
-    def test_find_related_nodes_outgoing(self):
+    def test_iter_paths_is_depth_first_and_lazy(self):
         alice = self.graph.create_node("Person", "Alice")
         bob = self.graph.create_node("Person", "Bob")
         charlie = self.graph.create_node("Person", "Charlie")
         self.graph.create_edge(alice.node_id, bob.node_id, "knows")
+        self.graph.create_edge(bob.node_id, charlie.node_id, "knows")
         self.graph.create_edge(alice.node_id, charlie.node_id, "knows")
-        related = self.query.find_related_nodes(alice.node_id, direction="out")
-        self.assertEqual(len(related), 2)
+        iterator = self.query.iter_paths(alice.node_id, charlie.node_id)
+        self.assertEqual(next(iterator), [alice.node_id, bob.node_id, charlie.node_id])
+        self.assertEqual(list(iterator), [[alice.node_id, charlie.node_id]])
+        self.assertEqual(list(self.query.iter_paths(alice.node_id, alice.node_id)), [[alice.node_id]])
+        self.assertEqual(list(self.query.iter_paths(alice.node_id, charlie.node_id, max_depth=0)), [])
+    
+    def test_find_paths_deeper_than_recursion_limit(self):
+        length = sys.getrecursionlimit() + 100
+        with self.graph.batch():
+            chain = [self.graph.create_node("Person", f"P{i}") for i in range(length)]
+            for a, b in zip(chain, chain[1:]):
+                self.graph.create_edge(a.node_id, b.node_id, "knows")
+        paths = self.query.find_paths(chain[0].node_id, chain[-1].node_id, max_depth=length)
+        self.assertEqual(paths, [[n.node_id for n in chain]])
     
-    def test_find_related_nodes_incoming(self):
+    def test_find_no_path(self):
         alice = self.graph.create_node("Person", "Alice")
         bob = self.graph.create_node("Person", "Bob")
-        charlie = self.graph.create_node("Person", "Charlie")
-        self.graph.create_edge(bob.node_id, alice.node_id, "knows")
-        self.graph.create_edge(charlie.node_id, alice.node_id, "knows")
-        related = self.query.find_related_nodes(alice.node_id, direction="in")
-        self.assertEqual(len(related), 2)
+        paths = self.query.find_paths(alice.node_id, bob.node_id)
+        self.assertEqual(len(paths), 0)
     
-    def test_find_related_nodes_both(self):
+    def test_find_shortest_path(self):
+        nodes = [self.graph.create_node("Person", f"N{i}") for i in range(5)]
+        ids = [n.node_id for n in nodes]
+        self.graph.create_edge(ids[0], ids[1], "knows")
+        self.graph.create_edge(ids[1], ids[2], "knows")
+        self.graph.create_edge(ids[2], ids[3], "knows")
+        self.graph.create_edge(ids[3], ids[4], "knows")
+        self.graph.create_edge(ids[1], ids[3], "knows")
+        self.assertEqual(self.query.find_shortest_path(ids[0], ids[4]), [ids[0], ids[1], ids[3], ids[4]])
+        self.assertEqual(self.query.find_shortest_path(ids[4], ids[0]), [])
+        self.assertEqual(self.query.find_shortest_path(ids[2], ids[2]), [ids[2]])
+    
+    def test_find_related_nodes_by_direction(self):
         alice = self.graph.create_node("Person", "Alice")
         bob = self.graph.create_node("Person", "Bob")
         charlie = self.graph.create_node("Person", "Charlie")
+        dave = self.graph.create_node("Person", "Dave")
         self.graph.create_edge(alice.node_id, bob.node_id, "knows")
-        self.graph.create_edge(charlie.node_id, alice.node_id, "knows")
-        related = self.query.find_related_nodes(alice.node_id, direction="both")
-        self.assertEqual(len(related), 2)
+        self.graph.create_edge(alice.node_id, charlie.node_id, "knows")
+        self.graph.create_edge(dave.node_id, alice.node_id, "knows")
+        for direction, expected in (("out", 2), ("in", 1), ("both", 3)):
+            with self.subTest(direction=direction):
+                related = self.query.find_related_nodes(alice.node_id, direction=direction)
+                self.assertEqual(len(related), expected)
     
     def test_find_related_by_type(self):
         alice = self.graph.create_node("Person", "Alice")
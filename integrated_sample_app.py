@@ -3,14 +3,120 @@
 # Integrated Sample Application - Object Store + Graph System
 # ============================================================================
 
+import hashlib
 import json
+import logging
 import requests
 import os
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Iterable, Iterator, Union, BinaryIO, Tuple
 from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# Same (de)serialization, with its orjson guards, as the graph's own files
+from graph_system import _dumps, _loads
 
-class ObjectStoreClient:
+logger = logging.getLogger("integrated_sample_app")
+
+
+@dataclass(frozen=True)
+class PersonSpec:
+    """Demo person: node attributes plus the metadata stored for them"""
+    name: str
+    age: int
+    email: str
+    city: str
+    bio: str
+    interests: Tuple[str, ...]
+    created_date: str = "2025-10-17"
+    
+    @property
+    def picture_filename(self) -> str:
+        return f"{self.name.lower()}.png"
+    
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata JSON document for this person"""
+        return {
+            "name": self.name,
+            "age": self.age,
+            "email": self.email,
+            "city": self.city,
+            "bio": self.bio,
+            "interests": list(self.interests),
+            "created_date": self.created_date
+        }
+
+
+# People created by the demo; every step runs over this list
+PEOPLE = (
+    PersonSpec("Alice", 32, "alice@example.com", "New York", "Software Engineer",
+               ("Python", "Graph Databases", "Machine Learning")),
+    PersonSpec("Bob", 28, "bob@example.com", "San Francisco", "Data Scientist",
+               ("Data Analysis", "Graph Theory", "Deep Learning")),
+)
+
+# (source, target, attributes) of "knows" edges between people
+KNOWS = (
+    ("Bob", "Alice", {"since": 2018, "context": "university"}),
+)
+
+
+# Rules framing the console output
+_BAR = "=" * 70
+_DASH = "-" * 70
+
+# Minimal PNG for demo pictures: signature plus an IHDR chunk for a 1x1
+# image (bit depth 8, RGB) with a dummy CRC
+_SAMPLE_PNG = (
+    b"\x89PNG\r\n\x1a\n"
+    b"\x00\x00\x00\x0dIHDR"
+    b"\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00"
+    b"\x90\x77\x53\xde"
+)
+
+
+def _make_session(headers: Dict[str, str]) -> requests.Session:
+    """Create a keep-alive session with pooled connections and retries on transient errors"""
+    session = requests.Session()
+    session.headers.update(headers)
+    # Failed connections are retried for every method since nothing was sent;
+    # error statuses only for idempotent methods, so a POST that timed out at a
+    # gateway after the server acted on it cannot create a duplicate
+    retry = Retry(
+        total=5,
+        backoff_factor=0.1,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["GET", "HEAD", "PUT", "DELETE"]
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _already_exists(error: requests.HTTPError) -> bool:
+    """Check whether an API error reports a duplicate registration"""
+    return error.response.status_code == 400 and "already exists" in error.response.text
+
+
+class _SessionClient:
+    """Base for API clients sharing one requests.Session"""
+    
+    def close(self):
+        """Close pooled connections"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ObjectStoreClient(_SessionClient):
     """Client for Object Store REST API"""
     
     def __init__(self, base_url: str, token: str):
@@ -19,29 +125,81 @@ class ObjectStoreClient:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/octet-stream"
         }
+        self._session = _make_session(self.headers)
+        # Uploads by SHA-256 of their content, for put_if_absent
+        self._uploads: Dict[str, Future] = {}
+        self._uploads_lock = threading.Lock()
     
-    def create_object(self, data: bytes, versioned: bool = False) -> Dict[str, Any]:
-        """Create new object"""
+    def create_object(self, data: Union[bytes, BinaryIO, Iterable[bytes]],
+                      versioned: bool = False) -> Dict[str, Any]:
+        """
+        Create new object
+        
+        Args:
+            data: Object content as bytes, a binary file or an iterable of
+                byte chunks; files and iterables are streamed, so pass
+                open(path, "rb") for large files
+            versioned: Create a versioned object
+        """
         url = f"{self.base_url}/api/v1/objects"
         if versioned:
             url += "?versioned=true"
         
-        response = requests.post(url, data=data, headers=self.headers)
+        response = self._session.post(url, data=data)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
-    def get_object(self, object_id: str, version: int = None) -> bytes:
-        """Get object data"""
+    def put_if_absent(self, data: bytes) -> Dict[str, Any]:
+        """
+        Create an object unless this client already uploaded the same bytes
+        
+        Content is identified by its SHA-256 digest. Concurrent calls with
+        equal content share a single upload; a failed upload is forgotten so
+        it can be retried.
+        
+        Returns:
+            The create_object response of the (first) upload
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._uploads_lock:
+            upload = self._uploads.get(digest)
+            owner = upload is None
+            if owner:
+                upload = self._uploads[digest] = Future()
+        
+        if owner:
+            try:
+                upload.set_result(self.create_object(data))
+            except BaseException as e:
+                # Resolve the Future even on KeyboardInterrupt so waiters never hang
+                with self._uploads_lock:
+                    del self._uploads[digest]
+                upload.set_exception(e)
+                raise
+        return upload.result()
+    
+    def _object_url(self, object_id: str, version: int = None) -> str:
+        """URL of an object, optionally of one version"""
         url = f"{self.base_url}/api/v1/objects/{object_id}"
         if version:
             url += f"?version={version}"
-        
-        response = requests.get(url, headers=self.headers)
+        return url
+    
+    def get_object(self, object_id: str, version: int = None) -> bytes:
+        """Get object data (read fully into memory; use iter_object for large objects)"""
+        response = self._session.get(self._object_url(object_id, version))
         response.raise_for_status()
         return response.content
+    
+    def iter_object(self, object_id: str, version: int = None,
+                    chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """Stream object data in chunks as it arrives, keeping memory bounded"""
+        with self._session.get(self._object_url(object_id, version), stream=True) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
 
 
-class GraphClient:
+class GraphClient(_SessionClient):
     """Client for Graph REST API"""
     
     def __init__(self, base_url: str, token: str):
@@ -50,20 +208,23 @@ class GraphClient:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
+        self._session = _make_session(self.headers)
+        # Schemas registered by this client, keyed by a hash of the request
+        self._schema_cache: Dict[str, Dict] = {}
     
     def _get(self, endpoint: str) -> Dict[str, Any]:
         """GET request"""
         url = f"{self.base_url}/api/v1{endpoint}"
-        response = requests.get(url, headers=self.headers)
+        response = self._session.get(url)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def _post(self, endpoint: str, data: Dict) -> Dict[str, Any]:
         """POST request"""
         url = f"{self.base_url}/api/v1{endpoint}"
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self._session.post(url, data=_dumps(data))
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def register_schema(self, class_name: str, parent_class: str = "Thing", 
                        attributes: Dict = None, description: str = "") -> Dict:
@@ -74,7 +235,11 @@ class GraphClient:
             "attributes": attributes or {},
             "description": description
         }
-        return self._post("/schemas", data)
+        key = hashlib.blake2b(json.dumps(data, sort_keys=True).encode(), digest_size=16).hexdigest()
+        schema = self._schema_cache.get(key)
+        if schema is None:
+            schema = self._schema_cache[key] = self._post("/schemas", data)
+        return schema
     
     def create_node(self, class_name: str, name: str, attributes: Dict = None) -> Dict:
         """Create node"""
@@ -85,6 +250,10 @@ class GraphClient:
         }
         return self._post("/nodes", data)
     
+    def create_nodes(self, nodes: List[Dict]) -> List[Dict]:
+        """Create several nodes in one request; results keep the input order"""
+        return self._post("/nodes/batch", {"nodes": nodes})["nodes"]
+    
     def get_node(self, node_id: str) -> Dict:
         """Get node"""
         return self._get(f"/nodes/{node_id}")
@@ -100,6 +269,10 @@ class GraphClient:
         }
         return self._post("/edges", data)
     
+    def create_edges(self, edges: List[Dict]) -> List[Dict]:
+        """Create several edges in one request; results keep the input order"""
+        return self._post("/edges/batch", {"edges": edges})["edges"]
+    
     def get_related_nodes(self, node_id: str, direction: str = "both") -> Dict:
         """Get related nodes"""
         return self._get(f"/query/related/{node_id}?direction={direction}")
@@ -108,50 +281,83 @@ class GraphClient:
 class IntegratedApp:
     """Integrated Sample Application"""
     
+    # Metadata JSON below this size is stored on the node instead of in Object Store
+    METADATA_INLINE_LIMIT = 8192
+    
     def __init__(self, graph_api_url: str, object_store_url: str, token: str):
         self.graph = GraphClient(graph_api_url, token)
         self.object_store = ObjectStoreClient(object_store_url, token)
         self.token = token
     
+    def close(self):
+        """Close both clients' connections"""
+        self.graph.close()
+        self.object_store.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def create_sample_picture(self, name: str) -> bytes:
-        """Create a simple PNG-like binary for demo"""
-        # Create a minimal PNG header and simple data
-        png_header = bytes([137, 80, 78, 71, 13, 10, 26, 10])  # PNG signature
-        # Add minimal IHDR chunk for a 1x1 white pixel PNG
-        ihdr = bytes([
-            0, 0, 0, 13,  # chunk length
-            73, 72, 68, 82,  # "IHDR"
-            0, 0, 0, 1,  # width
-            0, 0, 0, 1,  # height
-            8, 2, 0, 0, 0,  # bit depth, color type, etc.
-            144, 119, 83, 222  # CRC (dummy)
-        ])
-        return png_header + ihdr
+        """Create a simple PNG-like binary for demo (the same bytes for every name)"""
+        return _SAMPLE_PNG
+    
+    def _persist_metadata(self, metadata: Dict) -> Dict[str, str]:
+        """
+        Store person metadata, inline when small
+        
+        Returns:
+            Node attributes referencing the metadata: metadata_inline with the
+            JSON itself below METADATA_INLINE_LIMIT bytes, else
+            metadata_object_id of the uploaded Object Store object
+        """
+        compact = _dumps(metadata)
+        if len(compact) < self.METADATA_INLINE_LIMIT:
+            return {"metadata_inline": compact.decode('utf-8')}
+        metadata_obj = self.object_store.create_object(_dumps(metadata, indent=True))
+        return {"metadata_object_id": metadata_obj["object_id"]}
+    
+    def _load_metadata(self, attributes: Dict) -> Dict:
+        """Load person metadata from node attributes written by _persist_metadata"""
+        inline = attributes.get("metadata_inline")
+        if inline is not None:
+            return _loads(inline.encode('utf-8'))
+        return _loads(self.object_store.get_object(attributes["metadata_object_id"]))
+    
+    def print_metadata_location(self, name: str, metadata_attributes: Dict):
+        """Print where a person's metadata was stored"""
+        if "metadata_inline" in metadata_attributes:
+            print(f"✓ {name} metadata stored inline ({len(metadata_attributes['metadata_inline'])} bytes)")
+        else:
+            print(f"✓ {name} metadata uploaded")
+            print(f"  Object ID: {metadata_attributes['metadata_object_id']}")
     
     def print_header(self, text: str):
         """Print formatted header"""
-        print(f"\n{'='*70}")
-        print(f"  {text}")
-        print(f"{'='*70}\n")
+        print(f"\n{_BAR}\n  {text}\n{_BAR}\n")
     
     def print_node_info(self, node: Dict, indent: str = ""):
         """Print node information"""
-        print(f"{indent}Node ID: {node['node_id']}")
-        print(f"{indent}Name: {node['name']}")
-        print(f"{indent}Class: {node['class_name']}")
+        lines = [
+            f"{indent}Node ID: {node['node_id']}",
+            f"{indent}Name: {node['name']}",
+            f"{indent}Class: {node['class_name']}"
+        ]
         if node['attributes']:
-            print(f"{indent}Attributes:")
-            for key, value in node['attributes'].items():
-                print(f"{indent}  {key}: {value}")
+            lines.append(f"{indent}Attributes:")
+            lines.extend(f"{indent}  {key}: {value}" for key, value in node['attributes'].items())
+        # One write per node keeps its lines together
+        print("\n".join(lines))
     
     def run(self):
         """Run the integrated sample application"""
         
-        print("\n" + "="*70)
-        print("  Integrated Sample Application")
-        print("  Object Store + Graph System")
-        print("="*70)
+        print(f"\n{_BAR}\n  Integrated Sample Application\n  Object Store + Graph System\n{_BAR}")
         
+        # Independent requests within a step run concurrently on this pool
+        pool = ThreadPoolExecutor(max_workers=8)
         try:
             # ====================================================================
             # Step 1: Register Schemas
@@ -167,13 +373,14 @@ class IntegratedApp:
                         "email": "string",
                         "city": "string",
                         "metadata_object_id": "string",
+                        "metadata_inline": "string",
                         "picture_node_id": "string"
                     },
                     description="A person with metadata and picture"
                 )
                 print(f"✓ Person schema registered")
             except requests.HTTPError as e:
-                if e.response.status_code == 400:
+                if _already_exists(e):
                     print(f"✓ Person schema already exists")
                 else:
                     raise
@@ -191,7 +398,7 @@ class IntegratedApp:
                 )
                 print(f"✓ Picture schema registered")
             except requests.HTTPError as e:
-                if e.response.status_code == 400:
+                if _already_exists(e):
                     print(f"✓ Picture schema already exists")
                 else:
                     raise
@@ -202,181 +409,136 @@ class IntegratedApp:
             self.print_header("Step 2: Upload Pictures to Object Store")
             
             print("Creating sample pictures...")
-            alice_picture_data = self.create_sample_picture("Alice")
-            bob_picture_data = self.create_sample_picture("Bob")
-            
-            alice_picture_obj = self.object_store.create_object(alice_picture_data)
-            alice_picture_id = alice_picture_obj["object_id"]
-            print(f"✓ Alice picture uploaded")
-            print(f"  Object ID: {alice_picture_id}")
-            print(f"  Size: {alice_picture_obj['metadata']['size']} bytes")
-            
-            bob_picture_obj = self.object_store.create_object(bob_picture_data)
-            bob_picture_id = bob_picture_obj["object_id"]
-            print(f"✓ Bob picture uploaded")
-            print(f"  Object ID: {bob_picture_id}")
-            print(f"  Size: {bob_picture_obj['metadata']['size']} bytes")
+            picture_futures = [
+                pool.submit(self.object_store.put_if_absent, self.create_sample_picture(person.name))
+                for person in PEOPLE
+            ]
+            
+            picture_ids = {}
+            for person, future in zip(PEOPLE, picture_futures):
+                picture_obj = future.result()
+                picture_ids[person.name] = picture_obj["object_id"]
+                print(f"✓ {person.name} picture uploaded")
+                print(f"  Object ID: {picture_obj['object_id']}")
+                print(f"  Size: {picture_obj['metadata']['size']} bytes")
             
             # ====================================================================
-            # Step 3: Upload Metadata to Object Store
+            # Step 3: Store Metadata (inline when small, else in Object Store)
             # ====================================================================
-            self.print_header("Step 3: Upload Metadata JSON to Object Store")
+            self.print_header("Step 3: Store Metadata JSON")
             
-            alice_metadata = {
-                "name": "Alice",
-                "age": 32,
-                "email": "alice@example.com",
-                "city": "New York",
-                "bio": "Software Engineer",
-                "interests": ["Python", "Graph Databases", "Machine Learning"],
-                "created_date": "2025-10-17"
-            }
-            alice_metadata_json = json.dumps(alice_metadata, indent=2).encode('utf-8')
-            alice_metadata_obj = self.object_store.create_object(alice_metadata_json)
-            alice_metadata_id = alice_metadata_obj["object_id"]
+            metadata_futures = [pool.submit(self._persist_metadata, person.metadata()) for person in PEOPLE]
             
-            print(f"✓ Alice metadata uploaded")
-            print(f"  Object ID: {alice_metadata_id}")
-            print(f"  Content: {json.dumps(alice_metadata, indent=4)}")
-            
-            bob_metadata = {
-                "name": "Bob",
-                "age": 28,
-                "email": "bob@example.com",
-                "city": "San Francisco",
-                "bio": "Data Scientist",
-                "interests": ["Data Analysis", "Graph Theory", "Deep Learning"],
-                "created_date": "2025-10-17"
-            }
-            bob_metadata_json = json.dumps(bob_metadata, indent=2).encode('utf-8')
-            bob_metadata_obj = self.object_store.create_object(bob_metadata_json)
-            bob_metadata_id = bob_metadata_obj["object_id"]
-            
-            print(f"✓ Bob metadata uploaded")
-            print(f"  Object ID: {bob_metadata_id}")
-            print(f"  Content: {json.dumps(bob_metadata, indent=4)}")
+            metadata_attributes = {}
+            for person, future in zip(PEOPLE, metadata_futures):
+                metadata_attributes[person.name] = future.result()
+                self.print_metadata_location(person.name, metadata_attributes[person.name])
+                print(f"  Content: {json.dumps(person.metadata(), indent=4)}")
             
             # ====================================================================
             # Step 4: Create Picture Nodes in Graph
             # ====================================================================
             self.print_header("Step 4: Create Picture Nodes in Graph")
             
-            alice_picture_node = self.graph.create_node(
-                "Picture",
-                "Alice's Picture",
+            picture_nodes = self.graph.create_nodes([
                 {
-                    "object_store_id": alice_picture_id,
-                    "mime_type": "image/png",
-                    "filename": "alice.png"
+                    "class_name": "Picture",
+                    "name": f"{person.name}'s Picture",
+                    "attributes": {
+                        "object_store_id": picture_ids[person.name],
+                        "mime_type": "image/png",
+                        "filename": person.picture_filename
+                    }
                 }
-            )
-            alice_picture_node_id = alice_picture_node["node_id"]
-            print(f"✓ Alice picture node created")
-            self.print_node_info(alice_picture_node, indent="  ")
+                for person in PEOPLE
+            ])
             
-            bob_picture_node = self.graph.create_node(
-                "Picture",
-                "Bob's Picture",
-                {
-                    "object_store_id": bob_picture_id,
-                    "mime_type": "image/png",
-                    "filename": "bob.png"
-                }
-            )
-            bob_picture_node_id = bob_picture_node["node_id"]
-            print(f"✓ Bob picture node created")
-            self.print_node_info(bob_picture_node, indent="  ")
+            picture_node_ids = {}
+            for person, picture_node in zip(PEOPLE, picture_nodes):
+                picture_node_ids[person.name] = picture_node["node_id"]
+                print(f"✓ {person.name} picture node created")
+                self.print_node_info(picture_node, indent="  ")
             
             # ====================================================================
             # Step 5: Create Person Nodes in Graph
             # ====================================================================
             self.print_header("Step 5: Create Person Nodes in Graph")
             
-            alice_node = self.graph.create_node(
-                "Person",
-                "Alice",
+            # Person nodes reference the picture node IDs, so they form a second batch
+            person_nodes = self.graph.create_nodes([
                 {
-                    "age": 32,
-                    "email": "alice@example.com",
-                    "city": "New York",
-                    "metadata_object_id": alice_metadata_id,
-                    "picture_node_id": alice_picture_node_id
+                    "class_name": "Person",
+                    "name": person.name,
+                    "attributes": {
+                        "age": person.age,
+                        "email": person.email,
+                        "city": person.city,
+                        **metadata_attributes[person.name],
+                        "picture_node_id": picture_node_ids[person.name]
+                    }
                 }
-            )
-            alice_node_id = alice_node["node_id"]
-            print(f"✓ Alice node created")
-            self.print_node_info(alice_node, indent="  ")
+                for person in PEOPLE
+            ])
             
-            bob_node = self.graph.create_node(
-                "Person",
-                "Bob",
-                {
-                    "age": 28,
-                    "email": "bob@example.com",
-                    "city": "San Francisco",
-                    "metadata_object_id": bob_metadata_id,
-                    "picture_node_id": bob_picture_node_id
-                }
-            )
-            bob_node_id = bob_node["node_id"]
-            print(f"✓ Bob node created")
-            self.print_node_info(bob_node, indent="  ")
+            person_node_ids = {}
+            for person, person_node in zip(PEOPLE, person_nodes):
+                person_node_ids[person.name] = person_node["node_id"]
+                print(f"✓ {person.name} node created")
+                self.print_node_info(person_node, indent="  ")
             
             # ====================================================================
             # Step 6: Create Relationships
             # ====================================================================
             self.print_header("Step 6: Create Relationships")
             
-            # Person -> Picture edge
-            alice_has_picture = self.graph.create_edge(
-                alice_node_id,
-                alice_picture_node_id,
-                "has_a",
-                {"relationship": "profile_picture"}
-            )
-            print(f"✓ Created edge: Alice has_a Picture")
-            print(f"  Edge Type: {alice_has_picture['edge_type']}")
-            
-            bob_has_picture = self.graph.create_edge(
-                bob_node_id,
-                bob_picture_node_id,
-                "has_a",
-                {"relationship": "profile_picture"}
-            )
-            print(f"✓ Created edge: Bob has_a Picture")
-            print(f"  Edge Type: {bob_has_picture['edge_type']}")
-            
-            # Person -> Person edge
-            knows_edge = self.graph.create_edge(
-                bob_node_id,
-                alice_node_id,
-                "knows",
-                {"since": 2018, "context": "university"}
-            )
-            print(f"✓ Created edge: Bob knows Alice")
-            print(f"  Edge Type: {knows_edge['edge_type']}")
+            # Person -> Picture edges, then Person -> Person edges
+            edges = [
+                (f"{person.name} has_a Picture", {
+                    "from_node_id": person_node_ids[person.name],
+                    "to_node_id": picture_node_ids[person.name],
+                    "edge_type": "has_a",
+                    "attributes": {"relationship": "profile_picture"}
+                })
+                for person in PEOPLE
+            ] + [
+                (f"{source} knows {target}", {
+                    "from_node_id": person_node_ids[source],
+                    "to_node_id": person_node_ids[target],
+                    "edge_type": "knows",
+                    "attributes": attributes
+                })
+                for source, target, attributes in KNOWS
+            ]
+            
+            created_edges = self.graph.create_edges([edge for _, edge in edges])
+            for (label, _), edge in zip(edges, created_edges):
+                print(f"✓ Created edge: {label}")
+                print(f"  Edge Type: {edge['edge_type']}")
             
             # ====================================================================
             # Step 7: Query and Display
             # ====================================================================
             self.print_header("Step 7: Query and Display Full Profile")
             
+            alice_node_id = person_node_ids["Alice"]
             alice_retrieved = self.graph.get_node(alice_node_id)
-            print(f"\nAlice's Complete Profile:")
-            print(f"-" * 70)
+            print(f"\nAlice's Complete Profile:\n{_DASH}")
             self.print_node_info(alice_retrieved, indent="  ")
             
-            alice_metadata_id_from_node = alice_retrieved["attributes"]["metadata_object_id"]
             alice_picture_id_from_node = alice_retrieved["attributes"]["picture_node_id"]
             
-            # Retrieve and display metadata
-            print(f"\n  Metadata (from Object Store):")
-            metadata_bytes = self.object_store.get_object(alice_metadata_id_from_node)
-            metadata = json.loads(metadata_bytes.decode('utf-8'))
+            # Metadata and picture node live in different services; fetch both at once
+            metadata_future = pool.submit(self._load_metadata, alice_retrieved["attributes"])
+            picture_node_future = pool.submit(self.graph.get_node, alice_picture_id_from_node)
+            
+            # Display metadata
+            source = "inline" if "metadata_inline" in alice_retrieved["attributes"] else "from Object Store"
+            print(f"\n  Metadata ({source}):")
+            metadata = metadata_future.result()
             print(f"    {json.dumps(metadata, indent=6)}")
             
             # Get picture node details
-            picture_node = self.graph.get_node(alice_picture_id_from_node)
+            picture_node = picture_node_future.result()
             picture_object_id = picture_node["attributes"]["object_store_id"]
             picture_filename = picture_node["attributes"]["filename"]
             
@@ -409,7 +571,7 @@ class IntegratedApp:
                     print(f"     └─ Access: {pic_url}")
                 else:
                     for key, value in node["attributes"].items():
-                        if key not in ["metadata_object_id", "picture_node_id"]:
+                        if key not in ["metadata_object_id", "metadata_inline", "picture_node_id"]:
                             print(f"     └─ {key}: {value}")
             
             # ====================================================================
@@ -417,22 +579,19 @@ class IntegratedApp:
             # ====================================================================
             self.print_header("Summary")
             
-            print(f"✓ Successfully created integrated demo:")
-            print(f"\n  Objects in Object Store:")
-            print(f"    - alice.png (picture): {alice_picture_id}")
-            print(f"    - alice_metadata.json: {alice_metadata_id}")
-            print(f"    - bob.png (picture): {bob_picture_id}")
-            print(f"    - bob_metadata.json: {bob_metadata_id}")
-            print(f"\n  Nodes in Graph:")
-            print(f"    - Person: Alice ({alice_node_id})")
-            print(f"    - Picture: Alice's Picture ({alice_picture_node_id})")
-            print(f"    - Person: Bob ({bob_node_id})")
-            print(f"    - Picture: Bob's Picture ({bob_picture_node_id})")
-            print(f"\n  Edges:")
-            print(f"    - Alice has_a Picture")
-            print(f"    - Bob has_a Picture")
-            print(f"    - Bob knows Alice")
-            print(f"\nApplication completed successfully!\n")
+            summary = [f"✓ Successfully created integrated demo:", f"\n  Objects in Object Store:"]
+            for person in PEOPLE:
+                metadata_location = metadata_attributes[person.name].get("metadata_object_id", "inline on Person node")
+                summary.append(f"    - {person.picture_filename} (picture): {picture_ids[person.name]}")
+                summary.append(f"    - {person.name.lower()}_metadata.json: {metadata_location}")
+            summary.append(f"\n  Nodes in Graph:")
+            for person in PEOPLE:
+                summary.append(f"    - Person: {person.name} ({person_node_ids[person.name]})")
+                summary.append(f"    - Picture: {person.name}'s Picture ({picture_node_ids[person.name]})")
+            summary.append(f"\n  Edges:")
+            summary.extend(f"    - {label}" for label, _ in edges)
+            summary.append(f"\nApplication completed successfully!\n")
+            print("\n".join(summary))
             
         except requests.exceptions.ConnectionError as e:
             print(f"\n✗ Connection Error: Could not connect to APIs")
@@ -441,8 +600,10 @@ class IntegratedApp:
             print(f"  - Object Store: python object_store.py server --port 5001")
         except Exception as e:
             print(f"\n✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
+            # Traceback formatting is left to the logging handlers
+            logger.exception("Integrated sample application failed")
+        finally:
+            pool.shutdown()
 
 
 if __name__ == "__main__":
@@ -451,5 +612,5 @@ if __name__ == "__main__":
     OBJECT_STORE_URL = "http://localhost:5001"
     API_TOKEN = "sk-admin-secret-token-123456"
     
-    app = IntegratedApp(GRAPH_API_URL, OBJECT_STORE_URL, API_TOKEN)
-    app.run()
+    with IntegratedApp(GRAPH_API_URL, OBJECT_STORE_URL, API_TOKEN) as app:
+        app.run()